@@ -0,0 +1,79 @@
+"""
+Regex micro-benchmark for the compiled pattern registry.
+
+Times every pattern in gInvoiceParser.extractor.patterns against
+representative invoice text for its vendor, both the way the hot loops use
+them (one search per line) and as a full scan of every page (finditer), and
+prints the patterns ordered by cost per invoice.
+
+    python benchmarks/bench_patterns.py --pages 20 --repeat 5 --vendor DV360
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gInvoiceParser.extractor.patterns import PATTERNS  # noqa: E402
+from samples import PRODUCTS, vendor_pages  # noqa: E402
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_vendor(vendor: str, n_pages: int, repeat: int) -> list[dict]:
+    if vendor == "COMMON":
+        pages = [lines for product in PRODUCTS for lines in vendor_pages(product, n_pages)]
+    else:
+        pages = vendor_pages(vendor, n_pages)
+    lines = [line for page in pages for line in page]
+    page_texts = ["\n".join(page) for page in pages]
+
+    results = []
+    for name, pattern in PATTERNS[vendor].items():
+        def per_line(search=pattern.search):
+            for line in lines:
+                search(line)
+
+        def per_page(finditer=pattern.finditer):
+            for text in page_texts:
+                for _ in finditer(text):
+                    pass
+
+        results.append({
+            "vendor": vendor,
+            "pattern": name,
+            "per_line_us": _best_of(repeat, per_line) * 1e6,
+            "per_page_us": _best_of(repeat, per_page) * 1e6,
+        })
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=20, help="pages per synthetic invoice")
+    ap.add_argument("--repeat", type=int, default=5, help="timing repeats (best of)")
+    ap.add_argument("--vendor", choices=sorted(PATTERNS), action="append", help="limit to vendor(s)")
+    args = ap.parse_args(argv)
+
+    results = []
+    for vendor in args.vendor or sorted(PATTERNS):
+        results.extend(bench_vendor(vendor, args.pages, args.repeat))
+
+    results.sort(key=lambda r: r["per_line_us"] + r["per_page_us"], reverse=True)
+    total = sum(r["per_line_us"] + r["per_page_us"] for r in results) or 1.0
+    print(f"{'vendor':<18}{'pattern':<24}{'per-line us':>14}{'per-page us':>14}{'share':>8}")
+    for r in results:
+        share = (r["per_line_us"] + r["per_page_us"]) / total
+        print(f"{r['vendor']:<18}{r['pattern']:<24}{r['per_line_us']:>14.1f}{r['per_page_us']:>14.1f}{share:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
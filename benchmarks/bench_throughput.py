@@ -0,0 +1,114 @@
+"""
+End-to-end throughput benchmark.
+
+Generates a synthetic corpus per vendor (see synthetic.py), then runs
+SuperHeroFlex.extract_all and export_by_product over each vendor's folder
+in a fresh interpreter, so every row's peak RSS belongs to that vendor
+alone. Reports docs/s, pages/s and peak RSS.
+
+    python benchmarks/bench_throughput.py --pages 5 50 300 --docs 4 --workers 4
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from samples import PRODUCTS  # noqa: E402
+from synthetic import generate_corpus  # noqa: E402
+
+
+def _peak_rss_mb():
+    """Peak RSS of this process and its workers, or None where resource is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_once(pdf_dir: Path, out_dir: Path, workers: int) -> dict:
+    """Time one extract + export pass; runs inside the child interpreter."""
+    from gInvoiceParser.parser import SuperHeroFlex
+
+    flex = SuperHeroFlex(pdf_dir=str(pdf_dir))
+    start = time.perf_counter()
+    flex.extract_all(workers=workers)
+    extract_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flex.export_by_product(out_dir)
+    export_s = time.perf_counter() - start
+
+    return {
+        "extract_s": extract_s,
+        "export_s": export_s,
+        "rows": sum(flex.row_counts.values()),
+        "stages": dict(flex.timings.totals),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def bench_vendor(product: str, corpus: Path, pages: int, docs: int, workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as out_dir:
+        cmd = [sys.executable, __file__, "--child", str(corpus / product), out_dir, "--workers", str(workers)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    total_s = result["extract_s"] + result["export_s"]
+    result.update(
+        vendor=product,
+        docs=docs,
+        pages=pages,
+        docs_per_s=docs / total_s if total_s else 0.0,
+        pages_per_s=pages / total_s if total_s else 0.0,
+    )
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--vendor", choices=PRODUCTS, action="append", help="limit to vendor(s)")
+    ap.add_argument("--pages", type=int, nargs="+", default=[5, 50, 300], help="page counts in each corpus")
+    ap.add_argument("--docs", type=int, default=2, help="invoices per vendor and page count")
+    ap.add_argument("--workers", type=int, default=1, help="extract_all worker processes")
+    ap.add_argument("--corpus", type=Path, help="reuse/generate the corpus here instead of a temp dir")
+    ap.add_argument("--json", action="store_true", help="print results as JSON lines")
+    ap.add_argument("--child", nargs=2, metavar=("PDF_DIR", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_once(Path(args.child[0]), Path(args.child[1]), args.workers)))
+        return
+
+    products = args.vendor or PRODUCTS
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus or Path(tmp)
+        generate_corpus(corpus, products, args.pages, args.docs)
+        docs = len(args.pages) * args.docs
+        pages = sum(args.pages) * args.docs
+        results = [bench_vendor(p, corpus, pages, docs, args.workers) for p in products]
+
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'vendor':<18}{'docs':>6}{'pages':>7}{'rows':>8}{'extract s':>11}{'export s':>10}"
+          f"{'docs/s':>9}{'pages/s':>9}{'peak MB':>9}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "n/a"
+        print(f"{r['vendor']:<18}{r['docs']:>6}{r['pages']:>7}{r['rows']:>8}{r['extract_s']:>11.2f}"
+              f"{r['export_s']:>10.2f}{r['docs_per_s']:>9.2f}{r['pages_per_s']:>9.1f}{rss:>9}")
+
+
+if __name__ == "__main__":
+    main()
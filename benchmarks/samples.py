@@ -0,0 +1,187 @@
+"""
+Representative invoice page text for every vendor identify_product knows.
+
+The layouts mirror what each extractor's regexes look for, with
+deterministic pseudo-random names and amounts. Used by the regex
+micro-benchmark and by the synthetic PDF generator.
+"""
+import random
+
+PRODUCTS = ("CM360", "GOOGLE_ADS", "GOOGLE_WORKSPACE", "LINKEDIN", "DV360", "SA360")
+
+_BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell", "Cyberdyne", "Soylent"]
+_WORDS = ["Spring", "Summer", "Brand", "Launch", "Retargeting", "Search", "Always On", "Holiday", "Promo", "Awareness"]
+_FOOTER = "For questions about this invoice please contact your billing support team. Page {page} of {pages}"
+
+
+def _brand(rng) -> str:
+    return f"{rng.choice(_BRANDS)} {rng.choice(['Corp', 'Inc', 'Group', 'Labs'])}"
+
+
+def _campaign(rng) -> str:
+    return f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {rng.randint(2023, 2025)}"
+
+
+def _money(rng, low=10, high=20000) -> str:
+    return f"{rng.uniform(low, high):,.2f}"
+
+
+def _billing_id(rng) -> str:
+    return "-".join(f"{rng.randint(0, 9999):04d}" for _ in range(3))
+
+
+def _cm360(rng, n_pages):
+    pages = [[
+        "Google LLC",
+        "Campaign Manager 360",
+        f"Invoice number: {rng.randint(10**9, 10**10 - 1)}",
+        "Jan 1, 2025 - Jan 31, 2025",
+        f"Billing ID: {_billing_id(rng)}",
+        f"Subtotal in USD ${_money(rng, 1000, 90000)}",
+        "Total amount due in USD",
+    ]]
+    for _ in range(1, n_pages):
+        page = []
+        for _ in range(10):
+            uom = rng.choice(["CPM", "Impressions", "Clicks"])
+            page += [
+                f'Advertiser: "{_brand(rng)}", ID: {rng.randint(10**7, 10**8 - 1)}',
+                f'Campaign: "{_campaign(rng)}", ID: {rng.randint(10**7, 10**8 - 1)}',
+                f"Fee: {rng.choice(['AD SERVING', 'VIDEO', 'DISPLAY'])} FEE",
+                f"{uom} {rng.uniform(0.01, 2):.2f} {rng.randint(1000, 999999):,} {rng.uniform(1, 999):.2f}",
+            ]
+        pages.append(page)
+    return pages
+
+
+def _google_ads(rng, n_pages):
+    pages = [[
+        "Google Ads",
+        f"Invoice number: {rng.randint(10**9, 10**10 - 1)}",
+        "Summary for Jan 1, 2025 - Jan 31, 2025",
+        f"Total amount due in USD ${_money(rng, 1000, 90000)}",
+        "Due Feb 28, 2025",
+        f"Billing ID: {_billing_id(rng)}",
+        _FOOTER.format(page=1, pages=n_pages),
+    ]]
+    for page_num in range(2, n_pages + 1):
+        page = [
+            f"Account ID: {rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            f"Account: {_brand(rng)}",
+            f"Account budget: {_campaign(rng)}",
+            "Description Quantity Units Amount($)",
+        ]
+        for _ in range(12):
+            page.append(
+                f"{_campaign(rng)} {rng.randint(1, 99999)} "
+                f"{rng.choice(['Clicks', 'Impressions'])} {_money(rng)}"
+            )
+        page += ["Invalid activity", f"-{_money(rng, 1, 50)}"]
+        page.append(_FOOTER.format(page=page_num, pages=n_pages))
+        pages.append(page)
+    return pages
+
+
+def _google_workspace(rng, n_pages):
+    pages = [[
+        "Google Workspace",
+        f"Invoice number: {rng.randint(10**9, 10**10 - 1)}",
+        "Summary for Jan 1, 2025 - Jan 31, 2025",
+        f"Billing ID: {_billing_id(rng)}",
+        f"Domain: {rng.choice(_BRANDS).lower()}.com",
+        f"Subtotal in USD ${_money(rng, 100, 9000)}",
+    ]]
+    for _ in range(1, n_pages):
+        pages.append([
+            f"Google Workspace Enterprise Standard Usage Jan 1 - Jan 31 {rng.randint(1, 500)} {_money(rng)}"
+            for _ in range(20)
+        ])
+    return pages
+
+
+def _linkedin(rng, n_pages):
+    pages = [[
+        "LinkedIn Corporation",
+        f"Invoice number: {rng.randint(10**8, 10**9 - 1)}",
+        f"FEIN: {rng.randint(10, 99)}-{rng.randint(10**6, 10**7 - 1)}",
+        "Due Date: 28-FEB-2025",
+        "Special Instructions",
+        f"Total {_money(rng, 1000, 90000)}",
+    ]]
+    for _ in range(1, n_pages):
+        page = []
+        for line_no in range(1, 11):
+            page += [
+                f"{line_no} Campaign: {_campaign(rng)} 1 {_money(rng)} 0.00",
+                "Billing Period From 01-JAN-2025 To 31-JAN-2025",
+                f"{rng.choice(['CPM', 'CPC'])} Rate USD {rng.randint(5, 80)}",
+                f"Sponsored Content : {rng.randint(1, 5)} of 5",
+            ]
+        pages.append(page)
+    return pages
+
+
+def _dv360(rng, n_pages):
+    pages = [[
+        "Display & Video 360",
+        f"Invoice number: {rng.randint(10**9, 10**10 - 1)}",
+        "Summary for Jan 1, 2025 - Jan 31, 2025",
+        f"Total amount due in USD ${_money(rng, 1000, 900000)}",
+        "Due Feb 28, 2025",
+        f"Billing ID: {_billing_id(rng)}",
+    ]]
+    for _ in range(1, n_pages):
+        page = []
+        for _ in range(12):
+            fee = rng.choice(["Media Cost", "Platform Fee", "Data Fee"])
+            page += [
+                f"{fee} {rng.randint(1, 9)} EA {_money(rng)}",
+                f"Partner: {_brand(rng)} - US ID: {rng.randint(10**5, 10**6 - 1)}",
+                f"Advertiser: {_brand(rng)} ID: {rng.randint(10**9, 10**10 - 1)}",
+            ]
+        pages.append(page)
+    return pages
+
+
+def _sa360(rng, n_pages):
+    pages = [[
+        "Search Ads 360 - January 2025",
+        f"INVOICE #: {rng.randint(10**8, 10**9 - 1)}",
+        "Due Date: 02/28/2025",
+    ]]
+    for _ in range(1, n_pages):
+        page = []
+        for _ in range(10):
+            page += [
+                "% Media Spend",
+                f"Advertiser: {_brand(rng)} ID: {rng.randint(10**11, 10**12 - 1)}",
+                f"Account ID: {rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                f"{rng.randint(1000, 999999):,} {rng.uniform(0.01, 0.2):.2f} {_money(rng)}",
+            ]
+        pages.append(page)
+    pages[-1].append(f"TOTAL AMOUNT (USD) ${_money(rng, 1000, 90000)}")
+    return pages
+
+
+_BUILDERS = {
+    "CM360": _cm360,
+    "GOOGLE_ADS": _google_ads,
+    "GOOGLE_WORKSPACE": _google_workspace,
+    "LINKEDIN": _linkedin,
+    "DV360": _dv360,
+    "SA360": _sa360,
+}
+
+
+def vendor_pages(product: str, n_pages: int = 5, seed: int = 0) -> list[list[str]]:
+    """Lines of each page of a synthetic invoice; page 1 is the summary page."""
+    rng = random.Random(f"{product}-{n_pages}-{seed}")
+    return _BUILDERS[product](rng, max(n_pages, 1))
+
+
+def text_dict(product: str, n_pages: int = 5, seed: int = 0) -> dict:
+    """The same invoice in the {"page_N": {"text": ...}} shape build_text_dict returns."""
+    return {
+        f"page_{i + 1}": {"text": "\n".join(lines)}
+        for i, lines in enumerate(vendor_pages(product, n_pages, seed))
+    }
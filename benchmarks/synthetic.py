@@ -0,0 +1,102 @@
+"""
+Synthetic invoice PDF generator.
+
+Writes text-only PDFs whose pages carry the vendor layouts from samples.py,
+so the whole pipeline (pdfplumber, identify_product, the extractor and the
+export) can be exercised without real customer invoices.
+
+    python benchmarks/synthetic.py out/ --vendor DV360 --pages 5 50 400 --docs 3
+"""
+import argparse
+from pathlib import Path
+
+from samples import PRODUCTS, vendor_pages
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+FONT_SIZE, LEADING, MARGIN = 8, 10, 36
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _content_stream(lines: list[str]) -> bytes:
+    ops = ["BT", f"/F1 {FONT_SIZE} Tf", f"{LEADING} TL", f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+    ops += [f"({_escape(line)}) Tj T*" for line in lines]
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1", "replace")
+
+
+def pdf_bytes(pages: list[list[str]]) -> bytes:
+    """A minimal PDF with one Helvetica text page per list of lines."""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = add(b"")  # filled in once the page ids are known
+    kids = []
+    for lines in pages:
+        data = _content_stream(lines)
+        content = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        kids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>".encode()
+        ))
+    objects[pages_id - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode()
+    )
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def write_invoice(path, product: str, n_pages: int, seed: int = 0) -> Path:
+    path = Path(path)
+    path.write_bytes(pdf_bytes(vendor_pages(product, n_pages, seed)))
+    return path
+
+
+def generate_corpus(out_dir, products=PRODUCTS, sizes=(5,), docs: int = 1) -> list[Path]:
+    """
+    Write `docs` invoices of every size for each product into out_dir/<product>/
+    and return their paths. Files are named <product>_<pages>p_<seed>.pdf.
+    """
+    out_dir = Path(out_dir)
+    paths = []
+    for product in products:
+        product_dir = out_dir / product
+        product_dir.mkdir(parents=True, exist_ok=True)
+        for n_pages in sizes:
+            for seed in range(docs):
+                path = product_dir / f"{product.lower()}_{n_pages}p_{seed}.pdf"
+                paths.append(write_invoice(path, product, n_pages, seed))
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("out_dir", type=Path)
+    ap.add_argument("--vendor", choices=PRODUCTS, action="append", help="limit to vendor(s)")
+    ap.add_argument("--pages", type=int, nargs="+", default=[5, 50], help="page counts to generate")
+    ap.add_argument("--docs", type=int, default=1, help="invoices per vendor and page count")
+    args = ap.parse_args(argv)
+
+    paths = generate_corpus(args.out_dir, args.vendor or PRODUCTS, args.pages, args.docs)
+    print(f"Wrote {len(paths)} PDFs under {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
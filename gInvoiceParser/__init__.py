@@ -1,5 +1,12 @@
-from .gui import InvoiceApp, main
 from .parser import SuperHeroFlex
 
 __all__ = ["SuperHeroFlex", "InvoiceApp", "main"]
 
+
+def __getattr__(name):
+    # The GUI pulls in tkinter, so only import it when it is asked for;
+    # the CLI and library use must work on hosts without a display.
+    if name in ("InvoiceApp", "main"):
+        from . import gui
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
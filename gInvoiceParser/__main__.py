@@ -1,4 +1,12 @@
-from gInvoiceParser.gui import main
+import multiprocessing
+import sys
 
 if __name__ == "__main__":
+    # Needed for the process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        # Any arguments mean a headless CLI run; keep tkinter out of it
+        from gInvoiceParser.cli import main as cli_main
+        sys.exit(cli_main())
+    from gInvoiceParser.gui import main
     main()
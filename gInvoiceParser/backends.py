@@ -0,0 +1,138 @@
+"""
+Pluggable page-text backends.
+
+pdfplumber (pdfminer's pure-Python layout analysis) is the reference every
+extractor's regexes were written against. pypdfium2 wraps the PDFium C
+library and is many times faster at plain text extraction, so vendors whose
+extractors give the same rows on its text can be moved to it through
+PRODUCT_BACKENDS. Run `python -m gInvoiceParser parity` on sample invoices
+before moving a vendor.
+"""
+import io
+
+import pdfplumber
+
+from gInvoiceParser.layouts import absolute_bbox
+
+
+class TextBackend:
+    """Opens a PDF and returns the text of single pages."""
+
+    name = ""
+
+    @property
+    def fingerprint(self) -> str:
+        """Name and library version; part of every cache key built from this backend's text."""
+        return self.name
+
+    def open(self, source):
+        raise NotImplementedError
+
+    def page_count(self, handle) -> int:
+        raise NotImplementedError
+
+    def page_text(self, handle, index: int, settings: dict, bbox=None) -> str:
+        """Text of one page; bbox is an optional relative (x0, top, x1, bottom) region to keep."""
+        raise NotImplementedError
+
+    def close(self, handle):
+        handle.close()
+
+
+class PdfplumberBackend(TextBackend):
+    name = "pdfplumber"
+
+    @property
+    def fingerprint(self) -> str:
+        return f"{self.name} {pdfplumber.__version__}"
+
+    def open(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        return pdfplumber.open(source)
+
+    def page_count(self, handle) -> int:
+        return len(handle.pages)
+
+    def page_text(self, handle, index: int, settings: dict, bbox=None) -> str:
+        page = handle.pages[index]
+        try:
+            region = page
+            if bbox:
+                # Characters outside the box are filtered out before layout analysis
+                region = page.within_bbox(absolute_bbox(bbox, page.bbox))
+            return region.extract_text(**settings)
+        finally:
+            # Drop the page's cached chars/layout so memory follows the largest page, not the page count
+            page.close()
+
+
+class PdfiumBackend(TextBackend):
+    """
+    PDFium text in content order. pdfplumber's extract_text settings don't
+    apply and are ignored; line breaks are normalised to "\\n".
+    """
+
+    name = "pypdfium2"
+
+    def __init__(self):
+        try:
+            import pypdfium2
+        except ImportError as e:
+            raise ImportError("The pypdfium2 backend requires pypdfium2: pip install pypdfium2") from e
+        self._pdfium = pypdfium2
+
+    @property
+    def fingerprint(self) -> str:
+        return f"{self.name} {getattr(self._pdfium, 'V_PYPDFIUM2', '?')}"
+
+    def open(self, source):
+        return self._pdfium.PdfDocument(source)
+
+    def page_count(self, handle) -> int:
+        return len(handle)
+
+    def page_text(self, handle, index: int, settings: dict, bbox=None) -> str:
+        page = handle[index]
+        textpage = page.get_textpage()
+        try:
+            if bbox:
+                # PDFium measures from the bottom-left corner, so flip the box vertically
+                width, height = page.get_size()
+                x0, top, x1, bottom = absolute_bbox(bbox, (0, 0, width, height))
+                text = textpage.get_text_bounded(left=x0, bottom=height - bottom, right=x1, top=height - top)
+            else:
+                text = textpage.get_text_bounded()
+        finally:
+            textpage.close()
+            page.close()
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+BACKENDS = {
+    PdfplumberBackend.name: PdfplumberBackend,
+    PdfiumBackend.name: PdfiumBackend,
+}
+
+# Backend used to classify documents and for any product not listed below
+DEFAULT_BACKEND = "pdfplumber"
+
+# Per-product overrides, e.g. {"GOOGLE_WORKSPACE": "pypdfium2"}
+PRODUCT_BACKENDS = {}
+
+_instances = {}
+
+
+def get_backend(name: str = None) -> TextBackend:
+    name = name or DEFAULT_BACKEND
+    backend = _instances.get(name)
+    if backend is None:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown text backend {name!r}; expected one of {sorted(BACKENDS)}")
+        backend = _instances[name] = BACKENDS[name]()
+    return backend
+
+
+def backend_for(product_type: str = None) -> TextBackend:
+    """The backend configured for a product type (the default one if unset)."""
+    return get_backend(PRODUCT_BACKENDS.get(product_type) or DEFAULT_BACKEND)
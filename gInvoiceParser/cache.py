@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+
+import pdfplumber
+
+DEFAULT_CACHE_DIR = Path.home() / ".gInvoiceParser" / "text_cache"
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TextCache:
+    """
+    Persistent cache of build_text_dict output.
+
+    Entries are keyed by a hash of the PDF bytes plus the text-extraction
+    settings (and pdfplumber version), stored as zlib-compressed JSON, and
+    evicted least-recently-used first once the cache grows past max_bytes.
+    """
+
+    SUFFIX = ".json.z"
+
+    def __init__(self, cache_dir=None, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = None
+
+    def key_for(self, pdf_bytes: bytes, settings: dict = None, backend: str = None) -> str:
+        # `backend` is the TextBackend fingerprint (name and library version)
+        settings_blob = json.dumps(
+            {"settings": settings or {}, "pdfplumber": pdfplumber.__version__, "backend": backend},
+            sort_keys=True,
+        )
+        digest = hashlib.sha256()
+        digest.update(hash_bytes(pdf_bytes).encode())
+        digest.update(settings_blob.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            text_dict = json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError):
+            # Corrupt or partially written entry; drop it and re-extract
+            path.unlink(missing_ok=True)
+            return None
+        # Bump mtime so eviction sees this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text_dict
+
+    def put(self, key: str, text_dict: dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = zlib.compress(json.dumps(text_dict).encode("utf-8"), 6)
+        # Write-then-rename so concurrent workers never see a torn entry
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._added(len(payload))
+
+    def writer(self, key: str) -> "EntryWriter":
+        """Write an entry page by page instead of handing put() the whole document."""
+        return EntryWriter(self, key)
+
+    def _added(self, nbytes: int):
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += nbytes
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for path in self.cache_dir.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield path, stat
+
+    def size(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self, target_bytes: int = None):
+        """Remove least recently used entries until the cache fits target_bytes."""
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= target_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+        self._size = total
+
+    def clear(self):
+        self.evict(target_bytes=0)
+
+
+class EntryWriter:
+    """
+    A cache entry written as pages arrive: each page is compressed onto a
+    temporary file straight away, so the document's text is never held
+    whole. commit() completes the entry (the same format put() writes) and
+    renames it into place; abort() discards it.
+    """
+
+    def __init__(self, cache: TextCache, key: str):
+        self.cache = cache
+        self.path = cache._path(key)
+        self.written = set()
+        self._fh = None
+        self._tmp_name = None
+        self._zip = None
+        self._size = 0
+
+    def _write(self, text: str):
+        data = self._zip.compress(text.encode("utf-8"))
+        self._fh.write(data)
+        self._size += len(data)
+
+    def add(self, key: str, entry: dict):
+        if key in self.written:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            self._fh = os.fdopen(fd, "wb")
+            self._zip = zlib.compressobj(6)
+            self._write('{"pages": {')
+        self._write(("," if self.written else "") + f"{json.dumps(key)}: {json.dumps(entry)}")
+        self.written.add(key)
+
+    def commit(self, page_count: int):
+        if self._fh is None:
+            return
+        try:
+            self._write(f'}}, "page_count": {json.dumps(page_count)}}}')
+            tail = self._zip.flush()
+            self._fh.write(tail)
+            self._fh.close()
+            os.replace(self._tmp_name, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        self._fh = None
+        self.cache._added(self._size + len(tail))
+
+    def abort(self):
+        if self._fh is not None:
+            self._fh.close()
+            Path(self._tmp_name).unlink(missing_ok=True)
+            self._fh = None
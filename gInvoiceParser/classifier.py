@@ -0,0 +1,113 @@
+"""
+Product classifier.
+
+Every vendor registers weighted signature terms. All terms are compiled
+into one alternation, so each page is scanned once whatever the number of
+vendors. Page 1 is scored first and later pages are only read while no
+vendor is clearly ahead. A stray mention of another product (a Google Ads
+invoice naming Campaign Manager 360, say) therefore doesn't decide the
+result on its own.
+"""
+import re
+from collections import defaultdict
+
+from gInvoiceParser.document import as_document
+
+# {product_type: {term: weight}}; the product name itself carries most of the weight
+VENDOR_TERMS = {
+    "CM360": {"Campaign Manager 360": 3.0},
+    "GOOGLE_ADS": {"Google Ads": 3.0, "Account budget": 1.0},
+    "GOOGLE_WORKSPACE": {"Google Workspace": 3.0, "Enterprise Standard Usage": 1.0},
+    "LINKEDIN": {"LinkedIn": 3.0, "Sponsored Content": 1.0, "Advertiser Campaign": 1.0},
+    "DV360": {"Display and Video 360": 3.0, "Display & Video 360": 3.0, "Platform Fee": 1.0, "Media Cost": 1.0},
+    "SA360": {"Search Ads 360": 3.0, "TOTAL AMOUNT (USD)": 1.0},
+}
+
+
+class ProductClassifier:
+    """
+    Scores documents against registered vendor terms.
+
+    Only a vendor whose product name was found can win: a term weighted
+    `min_score` or more names the product, lighter ones only support it.
+    A vendor is "clearly ahead" once it is named, its score reaches
+    `min_score` and is at least `lead` times the runner-up's. Each term
+    counts at most `max_hits` times, so a repeated footer can't outweigh the
+    rest of the page.
+    """
+
+    def __init__(self, min_score: float = 3.0, lead: float = 2.0, max_hits: int = 3):
+        self.min_score = min_score
+        self.lead = lead
+        self.max_hits = max_hits
+        self.terms = {}
+        self._pattern = None
+
+    def register(self, product_type: str, terms: dict):
+        """Add (or extend) a vendor's {term: weight} signature."""
+        for term, weight in terms.items():
+            self.terms[term] = (product_type, float(weight))
+        self._pattern = None
+
+    @property
+    def pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            # Longest first, so a term that contains another one wins the alternation
+            ordered = sorted(self.terms, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(term) for term in ordered))
+        return self._pattern
+
+    def _is_decided(self, scores: dict, named: set) -> bool:
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        if not ranked or ranked[0] not in named or scores[ranked[0]] < self.min_score:
+            return False
+        return len(ranked) == 1 or scores[ranked[0]] >= self.lead * scores[ranked[1]]
+
+    def classify(self, text_dict, page_limit: int = 3) -> tuple[str, float]:
+        """
+        Returns (product_type, confidence), confidence being the winner's share
+        of all scores. A document that names no vendor (supporting terms
+        alone, however often repeated) or whose best named vendor stays below
+        `min_score` is "UNKNOWN" with confidence 0.0. Ties go to the vendor
+        seen first.
+        """
+        doc = as_document(text_dict)
+        scores = defaultdict(float)
+        hits = defaultdict(int)
+        named = set()
+        first_seen = {}
+        position = 0
+        for i in range(min(len(doc), page_limit)):
+            text = doc.page_text(f"page_{i + 1}")
+            for match in self.pattern.finditer(text):
+                term = match.group(0)
+                product_type, weight = self.terms[term]
+                first_seen.setdefault(product_type, position + match.start())
+                if weight >= self.min_score:
+                    named.add(product_type)
+                if hits[term] < self.max_hits:
+                    hits[term] += 1
+                    scores[product_type] += weight
+            position += len(text) + 1
+            if self._is_decided(scores, named):
+                break
+        if not named:
+            return "UNKNOWN", 0.0
+        product_type = max(named, key=lambda p: (scores[p], -first_seen[p]))
+        if scores[product_type] < self.min_score:
+            return "UNKNOWN", 0.0
+        return product_type, scores[product_type] / sum(scores.values())
+
+
+CLASSIFIER = ProductClassifier()
+for _product_type, _terms in VENDOR_TERMS.items():
+    CLASSIFIER.register(_product_type, _terms)
+
+
+def register_vendor(product_type: str, terms: dict):
+    """Teach the default classifier a new (or extra) vendor signature."""
+    CLASSIFIER.register(product_type, terms)
+
+
+def classify(text_dict, page_limit: int = 3) -> tuple[str, float]:
+    return CLASSIFIER.classify(text_dict, page_limit)
@@ -0,0 +1,241 @@
+"""
+Headless command line interface.
+
+    python -m gInvoiceParser extract INPUT [INPUT ...] -o OUTPUT_DIR [--jobs N] [--format FMT]
+    python -m gInvoiceParser watch DIRECTORY -o OUTPUT_DIR [--jobs N] [--format FMT]
+    python -m gInvoiceParser parity INPUT [INPUT ...] [--backends pdfplumber pypdfium2]
+
+Inputs are PDF files or directories (walked recursively unless
+--no-recursive). A JSON summary is printed to stdout and logs go to
+stderr. Exit status is 0 on success, 1 if any document failed (or was not
+recognised, unless --ignore-unknown), and 2 on usage errors. `watch`
+runs until interrupted (Ctrl+C / SIGTERM), appending rows as invoices land.
+
+Nothing here imports tkinter.
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from itertools import chain
+from pathlib import Path
+
+from gInvoiceParser.cache import TextCache
+from gInvoiceParser.manifest import Manifest
+from gInvoiceParser.parser import SuperHeroFlex, extractor_map, iter_pdf_files
+from gInvoiceParser.results import ResultCache
+from gInvoiceParser.sinks import SINK_FORMATS, make_sink
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ["xlsx", *SINK_FORMATS]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="gInvoiceParser", description="Extract structured data from invoice PDFs.")
+    sub = ap.add_subparsers(dest="command", metavar="COMMAND")
+
+    extract = sub.add_parser("extract", help="extract a batch of PDFs and exit")
+    extract.add_argument("inputs", nargs="+", type=Path, help="PDF files and/or directories")
+    extract.add_argument("-o", "--output-dir", type=Path, required=True, help="where to write the output")
+    extract.add_argument("-j", "--jobs", type=int, default=1,
+                         help="worker processes (0 = one per CPU; default 1)")
+    extract.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="xlsx",
+                         help="xlsx writes one workbook per product at the end; the others stream rows")
+    extract.add_argument("--append", action="store_true", help="append to existing streamed output")
+    extract.add_argument("--single-workbook", action="store_true",
+                         help="with xlsx, write one workbook with a sheet per product")
+    extract.add_argument("--no-recursive", dest="recursive", action="store_false",
+                         help="don't descend into subfolders of input directories")
+    extract.add_argument("--text-cache", nargs="?", const="", metavar="DIR",
+                         help="reuse extracted page text across runs (default dir: ~/.gInvoiceParser/text_cache)")
+    extract.add_argument("--manifest", nargs="?", const="", metavar="DIR",
+                         help="skip PDFs unchanged since an earlier run and reuse their rows; with "
+                              "--append their rows are not written again (default dir: OUTPUT_DIR/.manifest)")
+    extract.add_argument("--result-cache", nargs="?", const="", metavar="DIR",
+                         help="reuse parsed rows of any PDF seen before by the same extractor version, "
+                              "matched by content (default dir: ~/.gInvoiceParser/result_cache; needs pyarrow)")
+    extract.add_argument("--max-doc-memory", type=float, metavar="MB",
+                         help="fail any PDF that grows a worker's memory by more than MB")
+    extract.add_argument("--dedup", action="store_true",
+                         help="skip re-sent copies of an invoice (same bytes, or same vendor, "
+                              "invoice number and billing ID on page 1)")
+    extract.add_argument("--ignore-unknown", action="store_true",
+                         help="don't fail the run on PDFs no extractor recognises")
+    extract.add_argument("--log-level", default="WARNING", help="stderr log level (default WARNING)")
+    extract.set_defaults(func=run_extract)
+
+    watch = sub.add_parser("watch", help="watch a folder and process PDFs as they arrive")
+    watch.add_argument("directory", type=Path, help="folder to watch")
+    watch.add_argument("-o", "--output-dir", type=Path, required=True, help="where to append the output")
+    watch.add_argument("-j", "--jobs", type=int, default=2, help="worker processes kept warm (default 2)")
+    watch.add_argument("-f", "--format", choices=sorted(SINK_FORMATS), default="csv",
+                       help="streaming output format (default csv)")
+    watch.add_argument("--no-recursive", dest="recursive", action="store_false",
+                       help="don't watch subfolders")
+    watch.add_argument("--poll", action="store_true", help="poll instead of using inotify (e.g. network shares)")
+    watch.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls (default 1)")
+    watch.add_argument("--settle", type=float, default=1.0,
+                       help="seconds a file must stay unchanged before it is processed (default 1)")
+    watch.add_argument("--queue-size", type=int, default=100, help="max stable files waiting for a worker")
+    watch.add_argument("--new-only", dest="process_existing", action="store_false",
+                       help="ignore PDFs already in the folder at startup")
+    watch.add_argument("--manifest", metavar="DIR", help="manifest directory (default OUTPUT_DIR/.manifest)")
+    watch.add_argument("--text-cache", nargs="?", const="", metavar="DIR", help="reuse extracted page text")
+    watch.add_argument("--max-doc-memory", type=float, metavar="MB",
+                       help="fail any PDF that grows a worker's memory by more than MB")
+    watch.add_argument("--log-level", default="INFO", help="stderr log level (default INFO)")
+    watch.set_defaults(func=run_watch)
+
+    parity = sub.add_parser("parity", help="compare extractor output across text backends")
+    parity.add_argument("inputs", nargs="+", type=Path, help="sample PDF files and/or directories")
+    parity.add_argument("--backends", nargs="+", default=["pdfplumber", "pypdfium2"],
+                        help="backends to compare; the first is the reference "
+                             "(NAME:full ignores the vendors' layout profiles)")
+    parity.add_argument("--layout", nargs="+", default=[], metavar="PRODUCT", choices=sorted(extractor_map),
+                        help="crop these products' detail pages to the candidate NO_FOOTER profile, "
+                             "to check it against NAME:full")
+    parity.add_argument("--log-level", default="ERROR", help="stderr log level (default ERROR)")
+    parity.set_defaults(func=run_parity)
+    return ap
+
+
+def _make_flex(args, sink, text_cache, manifest, result_cache=None) -> SuperHeroFlex:
+    kwargs = {"text_cache": text_cache, "sink": sink, "recursive": args.recursive, "manifest": manifest,
+              "dedup": args.dedup, "result_cache": result_cache, "memory_limit_mb": args.max_doc_memory}
+    if len(args.inputs) == 1 and args.inputs[0].is_dir():
+        return SuperHeroFlex(pdf_dir=args.inputs[0], **kwargs)
+    files = chain.from_iterable(
+        iter_pdf_files(path, args.recursive) if path.is_dir() else [path] for path in args.inputs
+    )
+    return SuperHeroFlex(file_paths=list(files), **kwargs)
+
+
+def run_extract(args) -> int:
+    missing = [str(p) for p in args.inputs if not p.exists()]
+    if missing:
+        print(f"No such file or directory: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    text_cache = TextCache(args.text_cache or None) if args.text_cache is not None else None
+    result_cache = None
+    if args.result_cache is not None:
+        try:
+            result_cache = ResultCache(args.result_cache or None)
+        except ImportError as e:
+            print(e, file=sys.stderr)
+            return 2
+    sink = None if args.format == "xlsx" else make_sink(args.format, args.output_dir, append=args.append)
+    manifest = None
+    if args.manifest is not None:
+        manifest = Manifest(args.manifest or args.output_dir / ".manifest")
+
+    try:
+        flex = _make_flex(args, sink, text_cache, manifest, result_cache)
+    except ValueError:
+        print("No PDF files found in the given inputs", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        flex.extract_all(workers=jobs)
+        if sink is None:
+            outputs = flex.export_by_product(args.output_dir, workers=jobs, single_workbook=args.single_workbook)
+        else:
+            outputs = sink.outputs
+    finally:
+        if sink is not None:
+            sink.close()
+    elapsed = time.perf_counter() - start
+
+    documents = len(flex.timings.documents)
+    summary = {
+        "documents": documents,
+        "skipped": len(flex.skipped),
+        "cached": len(flex.cached),
+        "duplicates": flex.duplicates,
+        "rows": dict(flex.row_counts),
+        "outputs": {product: str(path) for product, path in outputs.items()},
+        "failed": [{"file": path, "errors": errors} for path, errors in flex.failures.items()],
+        "unrecognized": flex.unrecognized,
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_s": round(documents / elapsed, 3) if elapsed else None,
+        "stages_s": {stage: round(s, 3) for stage, s in flex.timings.totals.items()},
+    }
+    print(json.dumps(summary, indent=2))
+
+    if flex.failures or (flex.unrecognized and not args.ignore_unknown):
+        return 1
+    return 0
+
+
+def run_watch(args) -> int:
+    from gInvoiceParser.watch import InvoiceWatcher
+
+    if not args.directory.is_dir():
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+
+    watcher = InvoiceWatcher(
+        args.directory,
+        sink=make_sink(args.format, args.output_dir, append=True),
+        # Saved after every invoice, so a restart never re-emits rows
+        manifest=Manifest(args.manifest or args.output_dir / ".manifest", autosave_every=1),
+        workers=args.jobs if args.jobs > 0 else os.cpu_count() or 1,
+        recursive=args.recursive,
+        poll=args.poll,
+        poll_interval=args.poll_interval,
+        settle=args.settle,
+        queue_size=args.queue_size,
+        process_existing=args.process_existing,
+        text_cache=TextCache(args.text_cache or None) if args.text_cache is not None else None,
+        memory_limit_mb=args.max_doc_memory,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    watcher.run()
+
+    flex = watcher.flex
+    print(json.dumps({
+        "documents": watcher.processed,
+        "rows": dict(flex.row_counts),
+        "outputs": {product: str(path) for product, path in flex.sink.outputs.items()},
+        "failed": [{"file": path, "errors": errors} for path, errors in flex.failures.items()],
+        "unrecognized": flex.unrecognized,
+    }, indent=2))
+    return 0
+
+
+def run_parity(args) -> int:
+    from gInvoiceParser.layouts import NO_FOOTER, register_layout
+    from gInvoiceParser.parity import compare_backends
+
+    for product_type in args.layout:
+        register_layout(product_type, {"detail": NO_FOOTER})
+
+    files = list(chain.from_iterable(
+        iter_pdf_files(path, True) if path.is_dir() else [path] for path in args.inputs
+    ))
+    if not files:
+        print("No PDF files found in the given inputs", file=sys.stderr)
+        return 1
+    report = compare_backends(files, args.backends)
+    print(json.dumps(report, indent=2))
+    return 1 if any(entry["mismatches"] for entry in report.values()) else 0
+
+
+def main(argv=None) -> int:
+    ap = _build_parser()
+    args = ap.parse_args(argv)
+    if args.command is None:
+        ap.print_help(sys.stderr)
+        return 2
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Duplicate invoice detection before extraction.
+
+Vendors re-send the same invoice under new file names. Two cheap checks
+catch the copies before any full text extraction:
+
+1. identical bytes: files are grouped by size and only same-size files
+   are hashed;
+2. same invoice: for files whose bytes differ, page 1 alone is read for
+   the vendor, invoice number and billing ID.
+
+The first file (in batch order) is kept and later copies are reported as
+duplicates of it.
+"""
+import logging
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from gInvoiceParser.cache import TextCache, hash_bytes
+from gInvoiceParser.classifier import classify
+from gInvoiceParser.document import InvoiceDocument
+from gInvoiceParser.extractor.patterns import PATTERNS
+
+logger = logging.getLogger(__name__)
+
+_BILLING_ID = re.compile(r"(?<!\d)(\d{4}-\d{4}-\d{4})(?!\d)")
+
+# Invoice number patterns tried on page 1, in order
+_INVOICE_NUMBER = (PATTERNS["COMMON"]["invoice_number"], PATTERNS["SA360"]["invoice_number"])
+
+
+def page_one_key(pdf_file, text_cache: TextCache = None):
+    """
+    (product_type, invoice_number, billing_id) read from page 1 only, or
+    None when page 1 has no invoice number.
+    """
+    from gInvoiceParser.parser import open_text_dict
+
+    with open_text_dict(pdf_file, text_cache) as text_dict:
+        doc = InvoiceDocument(text_dict, str(pdf_file))
+        text = doc.summary_text
+        product_type = classify(doc, page_limit=1)[0]
+        clean = doc.summary_text_clean
+    invoice_number = None
+    for pattern in _INVOICE_NUMBER:
+        match = pattern.search(text)
+        if match:
+            invoice_number = match.group(1)
+            break
+    if not invoice_number:
+        return None
+    match = _BILLING_ID.search(text) or _BILLING_ID.search(clean)
+    return product_type, invoice_number, match.group(1) if match else None
+
+
+def _key_or_none(pdf_file, text_cache: TextCache = None):
+    # Unreadable files are left for extraction to fail and report
+    try:
+        return page_one_key(pdf_file, text_cache)
+    except Exception as e:
+        logger.debug("Could not read page 1 of %s for dedup: %s", pdf_file, e)
+        return None
+
+
+def _describe(key) -> str:
+    product_type, invoice_number, billing_id = key
+    billing = f", billing ID {billing_id}" if billing_id else ""
+    return f"same {product_type} invoice number {invoice_number}{billing}"
+
+
+def find_duplicates(pdf_files, text_cache: TextCache = None, workers: int = 1):
+    """
+    Split pdf_files into (unique, duplicates), where duplicates is a list of
+    {"file", "duplicate_of", "reason"} in batch order.
+    """
+    # A file listed twice (e.g. a folder and a PDF inside it) is kept once, not
+    # reported as a copy of itself
+    listed = {}
+    for pdf_file in pdf_files:
+        listed.setdefault(os.path.realpath(pdf_file), Path(pdf_file))
+    pdf_files = list(listed.values())
+    duplicates = {}
+
+    by_size = defaultdict(list)
+    for pdf_file in pdf_files:
+        try:
+            by_size[os.stat(pdf_file).st_size].append(pdf_file)
+        except OSError:
+            continue
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+        seen = {}
+        for pdf_file in same_size:
+            try:
+                digest = hash_bytes(pdf_file.read_bytes())
+            except OSError:
+                continue
+            if digest in seen:
+                duplicates[pdf_file] = {"file": str(pdf_file), "duplicate_of": str(seen[digest]),
+                                        "reason": "identical bytes"}
+            else:
+                seen[digest] = pdf_file
+
+    candidates = [p for p in pdf_files if p not in duplicates]
+    if workers > 1 and len(candidates) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            keys = list(pool.map(_key_or_none, candidates, [text_cache] * len(candidates),
+                                 chunksize=max(1, len(candidates) // (workers * 4))))
+    else:
+        keys = [_key_or_none(p, text_cache) for p in candidates]
+
+    seen = {}
+    for pdf_file, key in zip(candidates, keys):
+        if key is None:
+            continue
+        if key in seen:
+            duplicates[pdf_file] = {"file": str(pdf_file), "duplicate_of": str(seen[key]),
+                                    "reason": _describe(key)}
+        else:
+            seen[key] = pdf_file
+
+    unique = [p for p in pdf_files if p not in duplicates]
+    return unique, [duplicates[p] for p in pdf_files if p in duplicates]
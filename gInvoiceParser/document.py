@@ -0,0 +1,191 @@
+import re
+from collections.abc import Mapping
+from functools import cached_property
+
+from gInvoiceParser.backends import TextBackend, get_backend
+from gInvoiceParser.extractor.patterns import PATTERNS
+from gInvoiceParser.layouts import region_for
+from gInvoiceParser.memory import MemoryCeiling
+from gInvoiceParser.timing import StageTimer, timed
+
+_PAGE_KEY = re.compile(r"page_(\d+)$")
+
+
+class LazyTextDict(Mapping):
+    """
+    Read-only {"page_N": {"text": ...}} mapping over a PDF that only runs
+    text extraction on a page the first time its key is read.
+
+    `source` is a path or the raw PDF bytes. Pages already known (e.g. from
+    the text cache) can be seeded through `pages`/`page_count`, in which case
+    the PDF is not opened at all unless an unseen page is requested.
+    With a `timer`, opening is charged to the "open" stage and page
+    extraction to "text". Text comes from `backend` (a TextBackend or its
+    name; the default backend if omitted), cropped to the regions of a
+    `layout` profile when one is given. A MemoryCeiling passed as `memory`
+    is checked after every page.
+
+    Pages read by key are kept; pages read through stream() are not.
+    `on_extract(key, entry)` is called for every page as it is extracted,
+    e.g. to write it through to a text cache.
+    """
+
+    def __init__(self, source, settings: dict = None, pages: dict = None, page_count: int = None,
+                 timer: StageTimer = None, backend=None, layout: dict = None, memory: MemoryCeiling = None,
+                 on_extract=None):
+        self.source = source
+        self.memory = memory
+        self.on_extract = on_extract
+        self.settings = settings or {}
+        self.backend = backend if isinstance(backend, TextBackend) else get_backend(backend)
+        self.layout = layout
+        self._pages = dict(pages or {})
+        self._page_count = page_count
+        self._pdf = None
+        self.timer = timer
+
+    def _open(self):
+        if self._pdf is None:
+            with timed(self.timer, "open"):
+                self._pdf = self.backend.open(self.source)
+                self._page_count = self.backend.page_count(self._pdf)
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._open()
+        return self._page_count
+
+    @property
+    def extracted(self) -> dict:
+        """The pages whose text has been extracted so far."""
+        return dict(self._pages)
+
+    def __len__(self):
+        return self.page_count
+
+    def __iter__(self):
+        return (f"page_{i + 1}" for i in range(self.page_count))
+
+    def __contains__(self, key):
+        index = _page_index(key)
+        return index is not None and 1 <= index <= self.page_count
+
+    def __getitem__(self, key):
+        entry = self._pages.get(key)
+        if entry is not None:
+            return entry
+        if key not in self:
+            raise KeyError(key)
+        entry = self._pages[key] = self._extract(key)
+        return entry
+
+    def _extract(self, key) -> dict:
+        pdf = self._open()
+        index = _page_index(key) - 1
+        with timed(self.timer, "text"):
+            entry = {"text": self.backend.page_text(pdf, index, self.settings, region_for(self.layout, index))}
+        if self.memory is not None:
+            self.memory.check(key)
+        if self.on_extract is not None:
+            self.on_extract(key, entry)
+        return entry
+
+    def stream(self):
+        """
+        Yield (key, text) in page order, extracting each page only when it is
+        reached. Text extracted here is dropped once the caller moves on, so
+        only the current page is held.
+        """
+        for key in self:
+            entry = self._pages.get(key)
+            if entry is None:
+                entry = self._extract(key)
+            yield key, entry["text"] or ""
+
+    def close(self):
+        if self._pdf is not None:
+            self.backend.close(self._pdf)
+            self._pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InvoiceDocument(Mapping):
+    """
+    The text of one invoice as handed to the extractors.
+
+    Still reads like the text dict (`doc.get("page_1", {}).get("text")`),
+    but the joined and normalized text variants every extractor needs are
+    computed once per document and memoized.
+    """
+
+    def __init__(self, text_dict, filename: str = None):
+        self.pages = text_dict
+        self.filename = filename
+
+    def __getitem__(self, key):
+        return self.pages[key]
+
+    def __iter__(self):
+        return iter(self.pages)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def page_text(self, key: str) -> str:
+        return self.pages.get(key, {}).get("text") or ""
+
+    def iter_pages(self):
+        """
+        Yield (key, text) in page order. Over a LazyTextDict each page is
+        extracted when reached and its text isn't kept afterwards.
+        """
+        if isinstance(self.pages, LazyTextDict):
+            yield from self.pages.stream()
+            return
+        for key in self:
+            yield key, self.page_text(key)
+
+    @cached_property
+    def summary_text(self) -> str:
+        return self.page_text("page_1")
+
+    @cached_property
+    def full_text(self) -> str:
+        return "\n".join(self.page_text(k) for k in self)
+
+    @cached_property
+    def detail_text(self) -> str:
+        return "\n".join(self.page_text(k) for k in self if k != "page_1")
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """Stripped, non-empty lines of the full text."""
+        return [line.strip() for line in self.full_text.splitlines() if line.strip()]
+
+    @cached_property
+    def normalized_lines(self) -> list[str]:
+        """`lines` with en/em dashes folded to '-'."""
+        return [line.replace("\u2013", "-").replace("\u2014", "-") for line in self.lines]
+
+    @cached_property
+    def summary_text_clean(self) -> str:
+        """Page 1 with whitespace and dots removed, for dotted/spaced-out OCR text."""
+        return PATTERNS["COMMON"]["summary_clean"].sub('', self.summary_text)
+
+
+def as_document(text_dict, filename: str = None) -> InvoiceDocument:
+    if isinstance(text_dict, InvoiceDocument):
+        return text_dict
+    return InvoiceDocument(text_dict, filename)
+
+
+def _page_index(key):
+    match = _PAGE_KEY.match(key) if isinstance(key, str) else None
+    return int(match.group(1)) if match else None
@@ -0,0 +1,92 @@
+"""
+Streaming XLSX export.
+
+Workbooks are written with openpyxl's write-only mode: rows go straight to
+the sheet's XML stream in chunks of EXPORT_CHUNK_ROWS and are never held as
+cell objects, so memory stays flat however many rows a product has. Each
+product's frames are written one after another without concatenating them.
+Separate workbooks are independent and can be written in parallel processes.
+"""
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+# Rows converted from pandas and handed to openpyxl at a time
+EXPORT_CHUNK_ROWS = 10_000
+
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_title(name: str) -> str:
+    """A valid Excel sheet name (no []:*?/\\, at most 31 characters)."""
+    return _INVALID_SHEET_CHARS.sub("_", name)[:31] or "Sheet1"
+
+
+def _columns(frames: list) -> list:
+    columns = []
+    for df in frames:
+        columns.extend(c for c in df.columns if c not in columns)
+    return columns
+
+
+def iter_rows(frames: list, columns: list, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Yield the rows of `frames` as tuples in `columns` order, with NA/NaN as None."""
+    for df in frames:
+        if list(df.columns) != columns:
+            df = df.reindex(columns=columns)
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows].astype(object)
+            yield from chunk.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def write_workbook(path, sheets: dict, chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+    """
+    Write {sheet name: [DataFrame, ...]} to one write-only workbook at path.
+    Returns the number of data rows written.
+    """
+    path = Path(path)
+    workbook = Workbook(write_only=True)
+    rows = 0
+    for name, frames in sheets.items():
+        frames = [frames] if isinstance(frames, pd.DataFrame) else list(frames)
+        sheet = workbook.create_sheet(sheet_title(name))
+        columns = _columns(frames)
+        sheet.append(columns)
+        for row in iter_rows(frames, columns, chunk_rows):
+            sheet.append(row)
+            rows += 1
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return rows
+
+
+def _write_job(path, sheets: dict, chunk_rows: int):
+    start = perf_counter()
+    rows = write_workbook(path, sheets, chunk_rows)
+    return rows, perf_counter() - start
+
+
+def write_workbooks(jobs: dict, workers: int = 1, chunk_rows: int = EXPORT_CHUNK_ROWS) -> dict:
+    """
+    Write several workbooks, {path: {sheet name: [DataFrame, ...]}}, using up
+    to `workers` processes. Returns {path: (rows, seconds)}.
+    """
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        return {path: _write_job(path, sheets, chunk_rows) for path, sheets in jobs.items()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(_write_job, path, sheets, chunk_rows) for path, sheets in jobs.items()}
+        return {path: future.result() for path, future in futures.items()}
@@ -1,7 +1,13 @@
-import re
+import logging
 import pandas as pd
 from pathlib import Path
 from typing import Union
+from gInvoiceParser.document import as_document
+from gInvoiceParser.extractor.patterns import PATTERNS
+from gInvoiceParser.extractor.schema import SCHEMAS, RowBuilder
+
+P = PATTERNS["GOOGLE_ADS"]
+logger = logging.getLogger(__name__)
 
 def buffer_blocks_google_ads(full_text: str) -> list[str]:
     """
@@ -9,75 +15,72 @@ def buffer_blocks_google_ads(full_text: str) -> list[str]:
     to prevent account metadata from leaking between sections.
     """
     # Split on each occurrence of the footer line
-    pattern = r"For questions about this invoice.*?Page \d+ of \d+"
-    parts = re.split(pattern, full_text)
+    parts = P["page_footer"].split(full_text)
 
     blocks = [part.strip() for part in parts if part.strip()]
-    print(f"[DEBUG] Buffered {len(blocks)} blocks from full text using page footer strategy.")
-    for i, block in enumerate(blocks):
-        print(f"\n[BLOCK {i+1}]\n{'='*60}\n{block[:500]}\n{'='*60}")  # Truncated for readability
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Buffered %d blocks from full text using page footer strategy", len(blocks))
+        for i, block in enumerate(blocks):
+            logger.debug("Block %d:\n%s", i + 1, block[:500])  # Truncated for readability
     return blocks
 
 
 def extract_google_ads(text_dict, invoice_num: str, filename: str, invoice_month: str) -> Union[pd.DataFrame, None]:
-    summary_text = text_dict.get("page_1", {}).get("text", "")
-    full_text = "\n".join(p.get("text", "") for p in text_dict.values())
+    doc = as_document(text_dict)
+    summary_text = doc.summary_text
+    full_text = doc.full_text
 
-    print("\n[DEBUG] Full text dictionary content:")
-    for k, v in text_dict.items():
-        print(f"--- {k} ---\n{v.get('text', '')}\n")
+    if logger.isEnabledFor(logging.DEBUG):
+        for k in doc:
+            logger.debug("--- %s ---\n%s", k, doc.page_text(k))
 
     # Summary metadata
     # summary text clean eliminates white space for cleaner extraction
-    summary_text_clean = re.sub(r'[\s\.]+', '', summary_text)
-    print("\n[DEBUG] Cleaned summary_text:\n", summary_text_clean)
+    summary_text_clean = doc.summary_text_clean
+    logger.debug("Cleaned summary_text:\n%s", summary_text_clean)
 
 
-    invoice_number_match = re.search(r"Invoice number[:\s]*([0-9]+)", summary_text, re.IGNORECASE)
-    date_range_match = re.search(
-        r"Summary for\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})\s*[-\u2013]\s*([A-Za-z]+\s+\d{1,2},\s+\d{4})",
-        summary_text,
-        re.IGNORECASE
-    )
-    amount_match = re.search(r"TotalamountdueinUSD\$([\d,]+\.\d{2})", summary_text_clean, re.IGNORECASE)
-    due_date_match = re.search(r"Due([A-Za-z]+\d{1,2},\d{4})", summary_text_clean, re.IGNORECASE)
-    billing_id_match = re.search(r"BillingID[:]*([\d]{4}-[\d]{4}-[\d]{4})", summary_text_clean, re.IGNORECASE)
-    print("\n[DEBUG] billng id match:\n", billing_id_match)
-    print("\n[DEBUG] due date match:\n", due_date_match)
+    invoice_number_match = P["invoice_number"].search(summary_text)
+    date_range_match = P["date_range"].search(summary_text)
+    amount_match = P["total_due"].search(summary_text_clean)
+    due_date_match = P["due_date"].search(summary_text_clean)
+    billing_id_match = P["billing_id"].search(summary_text_clean)
+    logger.debug("Billing ID match: %s; due date match: %s", billing_id_match, due_date_match)
 
     billing_code = billing_id_match.group(1) if billing_id_match else None
     due_date = due_date_match.group(1) if due_date_match else ""
     invoice_number = invoice_number_match.group(1) if invoice_number_match else invoice_num
     month = f"{date_range_match.group(1)} - {date_range_match.group(2)}" if date_range_match else invoice_month
-    total_amount = float(amount_match.group(1).replace(",", "")) if amount_match else 0.0
-
-    rows = []
+    total_amount = amount_match.group(1) if amount_match else "0.00"
+
+    rows = RowBuilder(
+        SCHEMAS["GOOGLE_ADS"],
+        invoice_type="Google Ads",
+        invoice_num=invoice_number,
+        month=month,
+        filename=Path(filename).name,
+    )
 
     # Summary row
-    rows.append({
-        "InvoiceType": "Google Ads",
-        "Invoice#": invoice_number,
-        "Month": month,
-        "DueDate": due_date,
-        "BillingCode": billing_code,
-        "filename": Path(filename).name,
-        "RowType": "summary",
-        "Account ID": "SUMMARY",
-        "Account": "SUMMARY",
-        "Account budget": "SUMMARY",
-        "Description": "",
-        "Quantity": "",
-        "UOM": "",
-        "Amount($)": total_amount
-    })
+    rows.add(
+        due_date=due_date,
+        billing_code=billing_code,
+        row_type="summary",
+        account_id="SUMMARY",
+        account="SUMMARY",
+        account_budget="SUMMARY",
+        description="",
+        uom="",
+        amount=total_amount,
+    )
 
     # Block parsing
     blocks = buffer_blocks_google_ads(full_text)
 
     for block in blocks:
-        account_id_match = re.search(r"Account ID: (\S+)", block)
-        account_name_match = re.search(r"Account: (.+)", block)
-        account_budget_match = re.search(r"Account budget: (.+)", block)
+        account_id_match = P["account_id"].search(block)
+        account_name_match = P["account"].search(block)
+        account_budget_match = P["account_budget"].search(block)
 
         account_id = account_id_match.group(1).strip() if account_id_match else None
         account_name = account_name_match.group(1).strip() if account_name_match else None
@@ -96,13 +99,13 @@ def extract_google_ads(text_dict, invoice_num: str, filename: str, invoice_month
             amount = None
 
             # --- Case 1: Standard Clicks/Impressions ---
-            detail_match = re.match(r"(.+?)\s+(\d+)\s+(Clicks|Impressions)\s+([\d,.]+)", line)
+            detail_match = P["detail"].match(line)
             if detail_match:
                 desc, qty, uom, amount = detail_match.groups()
                 i += 1
 
             # --- Case 2: Multiline fallback for Invalid activity ---
-            elif "Invalid activity" in line and re.match(r"^-?\$?[\d,.]+$", next_line):
+            elif "Invalid activity" in line and P["amount_line"].match(next_line):
                 desc = line
                 amount = next_line
                 i += 2
@@ -111,25 +114,18 @@ def extract_google_ads(text_dict, invoice_num: str, filename: str, invoice_month
                 i += 1
                 continue
 
-            try:
-                rows.append({
-                    "InvoiceType": "Google Ads",
-                    "Invoice#": invoice_number,
-                    "Month": month,
-                    "filename": Path(filename).name,
-                    "RowType": "detail",
-                    "Account ID": account_id,
-                    "Account": account_name,
-                    "Account budget": account_budget,
-                    "Description": desc.strip(),
-                    "Quantity": int(qty) if qty else "",
-                    "UOM": uom,
-                    "Amount($)": float(str(amount).replace(",", "").replace("$", "")) if amount else None
-                })
-            except Exception as e:
-                print(f"[ERROR] Failed to parse row from line: '{line}'\n{e}")
-
-
-
-    print(f"\n[DEBUG] Parsed {len(rows)-1} detail rows + 1 summary row for {filename}")
-    return pd.DataFrame(rows) if rows else None
+            rows.add(
+                row_type="detail",
+                account_id=account_id,
+                account=account_name,
+                account_budget=account_budget,
+                description=desc.strip(),
+                quantity=qty or None,
+                uom=uom,
+                amount=amount or None,
+            )
+
+
+
+    logger.debug("Parsed %d detail rows + 1 summary row for %s", len(rows) - 1, filename)
+    return rows.build() if rows else None
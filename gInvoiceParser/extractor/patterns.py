@@ -0,0 +1,118 @@
+"""
+Compiled regular expressions for every vendor extractor.
+
+All patterns are compiled once at import time and looked up by vendor and
+name (`PATTERNS["DV360"]["fee_type"]`), so the per-block and per-line loops
+in the extractors never go through `re`'s internal compile cache.
+"""
+import re
+
+_DATE = r"[A-Za-z]+\s+\d{1,2},\s+\d{4}"
+_MONTHS = r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)"
+
+PATTERN_SPECS = {
+    "COMMON": {
+        "invoice_number": (r"Invoice number[:\s]*([0-9]{7,})", re.IGNORECASE),
+        "invoice_month": _MONTHS + r"[a-z]*\s+\d{1,2},\s+\d{4}\s*[-\u2013]\s*" + _MONTHS + r"[a-z]*\s+\d{1,2},\s+\d{4}",
+        "summary_clean": r"[\s\.]+",
+    },
+    "CM360": {
+        "spacing": r"(?<=\w)\s(?=\w)",
+        "junk": r"\b(?:CPM|CPC|Impressions|Clicks)\b\s*[\d.,]+\s*[\d,]+\s*[\d.,]+",
+        "number_run": r"[\d.,]{3,}",
+        "whitespace": r"\s+",
+        "billing_id": r"BillingID[:\s]*([\d]{4}-[\d]{4}-[\d]{4})",
+        "financials": r"\b(CPM|CPC|Impressions|Clicks)\b\s*([\d.]+)\s*([\d,]+)\s*([\d.]+)",
+        "advertiser": r"Advertiser:\s*\"(.*?)\"",
+        "campaign": (r"Campaign:\s*\"(.*?)\"", re.DOTALL),
+        "fee": r"Fee:\s*([A-Z /\-]+)",
+        "id": r"ID:\s*(\d{6,})",
+        "fallback_row": r"(CPM|Impressions|Clicks)\s+([\d.]+)\s+([\d,]+)\s+([\d,]+\.[\d]{2})",
+        "fallback_advertiser": r"Advertiser:\s*\"(.*?)\", ID:\s*(\d+)",
+        "fallback_campaign": r"Campaign:\s*\"(.*?)\"",
+        "subtotal": r"Subtotal in USD \$([\d,]+\.[\d]{2})",
+    },
+    "DV360": {
+        "block_end": r"\b\d{10}\b",
+        "invoice_number": (r"Invoice number[:\s]*([\d\-]+)", re.IGNORECASE),
+        "date_range": r"Summary for\s+(" + _DATE + r")\s*[-\u2013]\s*(" + _DATE + r")",
+        "total_due": r"Total amount due.*?\$([\d,]+\.\d{2})",
+        "due_date": r"Due\s+(" + _DATE + r")",
+        "billing_id": r"BillingID[:\s]*([\d]{4}-[\d]{4}-[\d]{4})",
+        "fee_type": (r"(Media Cost|Platform Fee|Data Fee|Overdelivery.*?|Previous month.*?)\b", re.IGNORECASE),
+        "partner": r"Partner:\s*(.+?)\s*-\s*(?:US|Constellation)\s+ID",
+        "partner_id": (r"Partner:.*?-\s*(?:US|Constellation)\s+ID[:\s]*(\d{5,})", re.IGNORECASE),
+        "partner_id_inline": r"\b(\d{6,})\b\s*-\s*Advertiser",
+        "ten_digit_id": r"\b(\d{10})\b",
+        "quantity": r"(\d+)\s+EA",
+        "amount": r"(-?\$?[\d,]+\.\d{2})",
+        "advertiser": r"Advertiser:\s*([\w\s&\-]+?)\s*ID",
+        "advertiser_id": r"Advertiser.*?ID:\s*(\d{6,})",
+        "long_number": r"\d{6,}",
+        "id_value": r"ID[:\s]*(\d{6,})",
+        "ten_digit_line": r"\d{10}",
+        "ten_digit_isolated": r"(?<!\d)(\d{10})(?!\d)",
+    },
+    "GOOGLE_ADS": {
+        "page_footer": r"For questions about this invoice.*?Page \d+ of \d+",
+        "invoice_number": (r"Invoice number[:\s]*([0-9]+)", re.IGNORECASE),
+        "date_range": (r"Summary for\s+(" + _DATE + r")\s*[-\u2013]\s*(" + _DATE + r")", re.IGNORECASE),
+        "total_due": (r"TotalamountdueinUSD\$([\d,]+\.\d{2})", re.IGNORECASE),
+        "due_date": (r"Due([A-Za-z]+\d{1,2},\d{4})", re.IGNORECASE),
+        "billing_id": (r"BillingID[:]*([\d]{4}-[\d]{4}-[\d]{4})", re.IGNORECASE),
+        "account_id": r"Account ID: (\S+)",
+        "account": r"Account: (.+)",
+        "account_budget": r"Account budget: (.+)",
+        "detail": r"(.+?)\s+(\d+)\s+(Clicks|Impressions)\s+([\d,.]+)",
+        "amount_line": r"^-?\$?[\d,.]+$",
+    },
+    "GOOGLE_WORKSPACE": {
+        "month": r"Summary for (.+? \d{4}\s*[-\u2013]\s*.+? \d{4})",
+        "invoice_number": r"Invoice number[:\s]*(\d+)",
+        "subtotal": r"Subtotal in USD \$([\d,]+\.\d{2})",
+        "billing_id": r"\b(\d{4}-\d{4}-\d{4})\b",
+        "domain": r"\b([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b",
+        "fallback_billing_id": r"(\d{4}-\d{4}-\d{4})",
+        "fallback_domain": (r"[a-zA-Z0-9-]+\.(com|org|net|edu|gov|co\.uk|io|ai)", re.IGNORECASE),
+        "usage_line": r"(Google Workspace Enterprise Standard Usage.*?)\s+(\d+)\s+([\d,]+\.\d{2})$",
+    },
+    "LINKEDIN": {
+        "campaign_start": r"^\d+\s+Campaign:",
+        "fein": r"FEIN:\s*([\d\-]+)",
+        "due_date": r"Due\s+Date\s*[:\uff1a]\s*(\d{1,2}-[A-Z]{3}-\d{4})",
+        "advertiser_campaign": r"Advertiser Campaign\s:\s\w+:\d{9}",
+        "total": r"Total\s+([\d,]+\.\d{2})",
+        "campaign": r"Campaign:\s*(.+?)\s+\d",
+        "numeric": r"^\d+(\.\d+)?$",
+        "campaign_name": r"[A-Za-z_]{4,}",
+        "billed": r"\b1\s+([\d,]+\.\d{2})\s+0\.00",
+        "billed_qty": r"Qty\s+1\s+([\d,]+\.\d{2})",
+        "billing_period": r"Billing\sPeriod\sFrom\s(\d+-\w{3}-\d+)\sTo\s(\d+-\w{3}-\d+)",
+        "uom": r"(CPM|CPC)\s(Rate)",
+        "quantity": r"Sponsored Content\s*:\s*(\d+)\s+of\s+\d+",
+        "billing_rate": r"USD\s+([\d,]+)",
+    },
+    "SA360": {
+        "invoice_number": (r"INVOICE\s+#?:?\s*(\d{5,})", re.IGNORECASE),
+        "month": (r"Search Ads 360\s*[-\u2013]\s*(\w+\s+\d{4})", re.IGNORECASE),
+        "due_date": (r"Due Date[:\s]+(\d{2}/\d{2}/\d{4})", re.IGNORECASE),
+        "financials": r"([\d,]+)\s+([\d.]+)\s+([\d,]+\.\d{2})",
+        "account_id": r"Account ID[:\s]+([\d\-]{7,})",
+        "advertiser": r"Advertiser:\s*(.*?)\s+ID:\s*(\d{12,})",
+        "advertiser_fallback": r"Advertiser:\s*(.*?)(?=ID:|Account ID|[\d]{1,3}[,\d]{3})",
+        "advertiser_id_fallback": r"\b(\d{12,})\b",
+        "total": (r"TOTAL AMOUNT \(USD\)\s*\$?([\d,]+\.\d{2})", re.IGNORECASE),
+    },
+}
+
+
+def _compile(spec) -> re.Pattern:
+    if isinstance(spec, tuple):
+        return re.compile(*spec)
+    return re.compile(spec)
+
+
+PATTERNS = {
+    vendor: {name: _compile(spec) for name, spec in specs.items()}
+    for vendor, specs in PATTERN_SPECS.items()
+}
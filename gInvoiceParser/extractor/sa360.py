@@ -1,23 +1,33 @@
-import re
+import logging
 import pandas as pd
 from typing import Union
+from gInvoiceParser.document import as_document
+from gInvoiceParser.extractor.patterns import PATTERNS
+from gInvoiceParser.extractor.schema import SCHEMAS, RowBuilder
 
-def extract_sa360(text_dict, invoice_num, filename, invoice_month) -> Union[pd.DataFrame, None]:
-    rows = []
+P = PATTERNS["SA360"]
+logger = logging.getLogger(__name__)
 
-    # Combine all page text
-    lines = []
-    for page in text_dict.values():
-        text = page.get("text", "")
-        lines.extend(text.splitlines())
+def extract_sa360(text_dict, invoice_num, filename, invoice_month) -> Union[pd.DataFrame, None]:
+    doc = as_document(text_dict)
 
-    lines = [line.strip() for line in lines if line.strip()]
-    full_text = "\n".join(lines)
+    # Stripped lines with en/em dashes already folded to '-'
+    lines = doc.normalized_lines
+    full_text = doc.full_text
 
     # Extract due date
-    due_date_match = re.search(r"Due Date[:\s]+(\d{2}/\d{2}/\d{4})", full_text, re.IGNORECASE)
+    due_date_match = P["due_date"].search(full_text)
     due_date_value = due_date_match.group(1) if due_date_match else ""
 
+    rows = RowBuilder(
+        SCHEMAS["SA360"],
+        invoice_type="Search Ads 360",
+        invoice_num=invoice_num,
+        month=invoice_month,
+        due_date=due_date_value,
+        filename=filename,
+    )
+
     # Buffer blocks until the next "% Media Spend"
     blocks = []
     current_block = []
@@ -30,86 +40,65 @@ def extract_sa360(text_dict, invoice_num, filename, invoice_month) -> Union[pd.D
             current_block.append(line)
     if current_block:
         blocks.append(" ".join(current_block).strip())
+    logger.debug("Buffered %d SA360 blocks for %s", len(blocks), filename)
 
     # Extract fields per block
-    for block in blocks:
-
-        # Normalize characters
-        cleaned = block.replace("–", "-").replace("—", "-")
+    for cleaned in blocks:
 
         # Financials
-        fin_match = re.search(r"([\d,]+)\s+([\d.]+)\s+([\d,]+\.\d{2})", cleaned)
-        quantity = fin_match.group(1).replace(",", "") if fin_match else ""
-        unit_price = fin_match.group(2) if fin_match else ""
-        amount = fin_match.group(3).replace(",", "") if fin_match else ""
+        fin_match = P["financials"].search(cleaned)
+        quantity, unit_price, amount = fin_match.groups() if fin_match else ("", "", "")
 
         # Account ID
-        account_match = re.search(r"Account ID[:\s]+([\d\-]{7,})", cleaned)
+        account_match = P["account_id"].search(cleaned)
         account_id = account_match.group(1) if account_match else ""
 
         # Advertiser
-        adv_match = re.search(r"Advertiser:\s*(.*?)\s+ID:\s*(\d{12,})", cleaned)
+        adv_match = P["advertiser"].search(cleaned)
         if adv_match:
             advertiser_name = adv_match.group(1).strip()
             advertiser_id = adv_match.group(2).strip()
         else:
             # Fallback for advertiser name
-            adv_fallback = re.search(r"Advertiser:\s*(.*?)(?=ID:|Account ID|[\d]{1,3}[,\d]{3})", cleaned)
+            adv_fallback = P["advertiser_fallback"].search(cleaned)
             advertiser_name = adv_fallback.group(1).strip() if adv_fallback else ""
 
             # Fallback for advertiser ID
-            id_fallback = re.search(r"\b(\d{12,})\b", cleaned)
+            id_fallback = P["advertiser_id_fallback"].search(cleaned)
             advertiser_id = id_fallback.group(1).strip() if id_fallback else ""
 
 
-        rows.append({
-            "InvoiceType": "Search Ads 360",
-            "Invoice#": invoice_num,
-            "Month": invoice_month,
-            "DueDate": due_date_value,
-            "filename": filename,
-            "RowType": "detail",
-            "AdvertiserName": advertiser_name,
-            "AdvertiserID": advertiser_id,
-            "Campaign": "",
-            "CampaignID": account_id,
-            "BillingCode": "",
-            "Fee": "% Media Spend",
-            "UoM": "",
-            "Unit Price": unit_price,
-            "Quantity": quantity,
-            "Amount($)": amount,
-        })
+        # Skip junk blocks that matched nothing at all
+        if not (amount or advertiser_name or advertiser_id or account_id):
+            continue
+
+        rows.add(
+            row_type="detail",
+            advertiser_name=advertiser_name,
+            advertiser_id=advertiser_id,
+            campaign="",
+            campaign_id=account_id,
+            billing_code="",
+            fee="% Media Spend",
+            uom="",
+            unit_price=unit_price or None,
+            quantity=quantity or None,
+            amount=amount or None,
+        )
 
     # Summary
-    subtotal_match = re.search(r"TOTAL AMOUNT \(USD\)\s*\$?([\d,]+\.\d{2})", full_text, re.IGNORECASE)
-    subtotal_value = subtotal_match.group(1).replace(",", "") if subtotal_match else ""
-    rows.append({
-        "InvoiceType": "Search Ads 360",
-        "Invoice#": invoice_num,
-        "Month": invoice_month,
-        "DueDate": due_date_value,
-        "filename": filename,
-        "RowType": "summary",
-        "AdvertiserName": "",
-        "AdvertiserID": "",
-        "Campaign": "",
-        "CampaignID": "",
-        "BillingCode": "",
-        "Fee": "Subtotal",
-        "UoM": "",
-        "Unit Price": "",
-        "Quantity": "",
-        "Amount($)": subtotal_value
-    })
-    
-    df = pd.DataFrame(rows)
-
-    # Remove any completely empty or junk rows
-    df = df[~((df["Amount($)"] == "") & 
-            (df["AdvertiserName"] == "") & 
-            (df["AdvertiserID"] == "") & 
-            (df["CampaignID"] == ""))]
-
-    return df
-
+    subtotal_match = P["total"].search(full_text)
+    if subtotal_match:
+        rows.add(
+            row_type="summary",
+            advertiser_name="",
+            advertiser_id="",
+            campaign="",
+            campaign_id="",
+            billing_code="",
+            fee="Subtotal",
+            uom="",
+            amount=subtotal_match.group(1),
+        )
+
+    return rows.build()
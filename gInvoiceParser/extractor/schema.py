@@ -0,0 +1,183 @@
+"""
+Output schemas for each product and a column-oriented row builder.
+
+Extractors append values straight into one list per column instead of
+building a dict per row, and the DataFrame is created once at the end. Every
+column is built as text, exactly as matched; amounts, quantities and dates
+are cast to the schema's dtypes later, a whole column at a time, by
+gInvoiceParser.normalize.
+"""
+import pandas as pd
+
+
+class Schema:
+    """
+    Ordered output columns for a product. Each field is
+    (name, column, dtype): `name` is the keyword used with RowBuilder.add,
+    `column` the exported column header and `dtype` its type once normalized.
+    """
+
+    def __init__(self, product_type: str, fields: list[tuple[str, str, str]]):
+        self.product_type = product_type
+        self.fields = fields
+        self.names = [name for name, _, _ in fields]
+        self.columns = [column for _, column, _ in fields]
+        self.dtypes = {column: dtype for _, column, dtype in fields}
+
+    def empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({column: pd.array([], dtype=dtype) for column, dtype in self.dtypes.items()})
+
+
+class RowBuilder:
+    """
+    Accumulates rows for one invoice column by column.
+
+    Values that are the same for every row (invoice number, month, filename)
+    are passed once as `constants` and broadcast when the frame is built.
+    """
+
+    def __init__(self, schema: Schema, **constants):
+        unknown = set(constants) - set(schema.names)
+        if unknown:
+            raise KeyError(f"Unknown {schema.product_type} fields: {sorted(unknown)}")
+        self.schema = schema
+        self.constants = constants
+        self._columns = {name: [] for name in schema.names if name not in constants}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def set_constant(self, name: str, value):
+        if name not in self.constants:
+            raise KeyError(f"{name!r} is not a constant of this builder")
+        self.constants[name] = value
+
+    def add(self, **values):
+        for name, column in self._columns.items():
+            column.append(values.pop(name, None))
+        if values:
+            # Roll back the partial row before complaining
+            for column in self._columns.values():
+                del column[self._length:]
+            raise KeyError(f"Unknown {self.schema.product_type} fields: {sorted(values)}")
+        self._length += 1
+
+    def drain(self) -> pd.DataFrame:
+        """Build the rows added so far and start over empty (constants are kept)."""
+        frame = self.build()
+        for column in self._columns.values():
+            column.clear()
+        self._length = 0
+        return frame
+
+    def build(self) -> pd.DataFrame:
+        data = {}
+        for name, column, _ in self.schema.fields:
+            if name in self.constants:
+                values = [self.constants[name]] * self._length
+            else:
+                values = self._columns[name]
+            data[column] = pd.array(values, dtype="string")
+        return pd.DataFrame(data)
+
+
+SCHEMAS = {
+    "CM360": Schema("CM360", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("filename", "filename", "string"),
+        ("row_type", "RowType", "string"),
+        ("billing_code", "BillingCode", "string"),
+        ("advertiser_name", "AdvertiserName", "string"),
+        ("advertiser_id", "AdvertiserID", "string"),
+        ("campaign", "Campaign", "string"),
+        ("campaign_id", "CampaignID", "string"),
+        ("fee", "Fee", "string"),
+        ("uom", "UoM", "string"),
+        ("unit_price", "Unit Price", "Float64"),
+        ("quantity", "Quantity", "Int64"),
+        ("amount", "Amount($)", "Float64"),
+    ]),
+    "DV360": Schema("DV360", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("due_date", "DueDate", "datetime64[ns]"),
+        ("filename", "filename", "string"),
+        ("row_type", "RowType", "string"),
+        ("fee_type", "FeeType", "string"),
+        ("partner", "Partner", "string"),
+        ("partner_id", "PartnerID", "string"),
+        ("advertiser_name", "AdvertiserName", "string"),
+        ("advertiser_id", "AdvertiserID", "string"),
+        ("billing_code", "BillingCode", "string"),
+        ("amount", "Amount($)", "Float64"),
+        ("source_page", "SourcePage", "string"),
+        ("quantity", "Quantity", "Int64"),
+        ("uom", "UOM", "string"),
+    ]),
+    "GOOGLE_ADS": Schema("GOOGLE_ADS", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("due_date", "DueDate", "datetime64[ns]"),
+        ("billing_code", "BillingCode", "string"),
+        ("filename", "filename", "string"),
+        ("row_type", "RowType", "string"),
+        ("account_id", "Account ID", "string"),
+        ("account", "Account", "string"),
+        ("account_budget", "Account budget", "string"),
+        ("description", "Description", "string"),
+        ("quantity", "Quantity", "Int64"),
+        ("uom", "UOM", "string"),
+        ("amount", "Amount($)", "Float64"),
+    ]),
+    "GOOGLE_WORKSPACE": Schema("GOOGLE_WORKSPACE", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("amount", "Amount($)", "Float64"),
+        ("billing_id", "BillingID", "string"),
+        ("domain", "Domain", "string"),
+        ("description", "Description", "string"),
+        ("quantity", "Quantity", "Int64"),
+        ("uom", "UOM", "string"),
+        ("row_type", "RowType", "string"),
+        ("filename", "filename", "string"),
+    ]),
+    "LINKEDIN": Schema("LINKEDIN", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("fein", "FEIN", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("due_date", "DueDate", "datetime64[ns]"),
+        ("filename", "filename", "string"),
+        ("row_type", "RowType", "string"),
+        ("quantity", "Quantity", "Int64"),
+        ("uom", "UOM", "string"),
+        ("campaign", "Campaign", "string"),
+        ("amount", "Amount($)", "Float64"),
+        ("billing_period", "BillingPeriod", "string"),
+        ("billing_rate", "BillingRate", "Float64"),
+    ]),
+    "SA360": Schema("SA360", [
+        ("invoice_type", "InvoiceType", "string"),
+        ("invoice_num", "Invoice#", "string"),
+        ("month", "Month", "string"),
+        ("due_date", "DueDate", "datetime64[ns]"),
+        ("filename", "filename", "string"),
+        ("row_type", "RowType", "string"),
+        ("advertiser_name", "AdvertiserName", "string"),
+        ("advertiser_id", "AdvertiserID", "string"),
+        ("campaign", "Campaign", "string"),
+        ("campaign_id", "CampaignID", "string"),
+        ("billing_code", "BillingCode", "string"),
+        ("fee", "Fee", "string"),
+        ("uom", "UoM", "string"),
+        ("unit_price", "Unit Price", "Float64"),
+        ("quantity", "Quantity", "Int64"),
+        ("amount", "Amount($)", "Float64"),
+    ]),
+}
@@ -0,0 +1,79 @@
+"""
+Page-streaming extractors.
+
+A StreamingExtractor is fed an invoice one page at a time, in page order,
+and adds rows as each page is parsed; rows that need the whole document are
+added by finalize(). Run over InvoiceDocument.iter_pages(), each page is
+extracted just before it is parsed and its text is dropped afterwards (see
+LazyTextDict.stream), so a long invoice never holds all of its page text.
+
+stream() yields each page's rows as soon as the page is parsed, for callers
+that consume rows incrementally. run() returns them as one DataFrame once
+the invoice is complete; the parser uses it, so an invoice that fails
+part-way never leaves half its rows in a sink.
+
+The `extract_*(text_dict, invoice_num, filename, invoice_month)` functions
+stay the entry point the parser calls; for ported vendors they simply run
+the streaming extractor over the document's pages.
+"""
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from gInvoiceParser.extractor.schema import RowBuilder
+
+
+class StreamingExtractor:
+    """
+    Subclasses implement start() for page 1 and page() for every later page,
+    and may override finalize(). Use run() for a single DataFrame or stream()
+    to receive rows page by page.
+    """
+
+    product_type = ""
+
+    def __init__(self, invoice_num: str, filename: str, invoice_month: str):
+        self.invoice_num = invoice_num
+        self.filename = filename
+        self.invoice_month = invoice_month
+        self.rows = None
+
+    def start(self, summary_text: str) -> RowBuilder:
+        """Parse page 1 and return the RowBuilder for this invoice, with any summary rows added."""
+        raise NotImplementedError
+
+    def page(self, key: str, text: str):
+        """Add the rows of one detail page."""
+
+    def finalize(self):
+        """Add rows that depend on the whole document; called once after the last page."""
+
+    def feed(self, key: str, text: str):
+        if self.rows is None:
+            # Page 1 opens the invoice; a document without one still gets its summary row
+            self.rows = self.start(text if key == "page_1" else "")
+            if key == "page_1":
+                return
+        self.page(key, text)
+
+    def finish(self):
+        if self.rows is None:
+            self.rows = self.start("")
+        self.finalize()
+
+    def stream(self, pages: Iterable[tuple[str, str]]) -> Iterator[pd.DataFrame]:
+        """Feed (key, text) pages and yield the rows each one produced, then the finalize rows."""
+        for key, text in pages:
+            self.feed(key, text)
+            if len(self.rows):
+                yield self.rows.drain()
+        self.finish()
+        if len(self.rows):
+            yield self.rows.drain()
+
+    def run(self, pages: Iterable[tuple[str, str]]) -> pd.DataFrame:
+        """Feed every page and return all rows as one DataFrame."""
+        for key, text in pages:
+            self.feed(key, text)
+        self.finish()
+        return self.rows.build()
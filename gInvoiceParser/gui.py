@@ -1,6 +1,10 @@
 import os
+import logging
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import pandas as pd
 import subprocess
 import platform
@@ -8,6 +12,10 @@ from gInvoiceParser.parser import SuperHeroFlex
 from gInvoiceParser import update
 from pathlib import Path
 
+# Worker processes for a GUI run; leave a core for the desktop
+GUI_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+POLL_MS = 100
+
 class InvoiceApp:
     def __init__(self, root):
         self.root = root
@@ -15,17 +23,36 @@ class InvoiceApp:
         self.file_paths = []
         self.output_file = None
 
+        # Extraction runs on a worker thread; it reports back through this
+        # queue, which the Tk loop drains every POLL_MS
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.parser = None
+
         self.build_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def build_gui(self):
         frame = tk.Frame(self.root, padx=20, pady=20)
         frame.pack(fill="both", expand=True)
 
-        tk.Button(frame, text="Upload PDFs", command=self.browse_files, width=20).pack(pady=5)
-        tk.Button(frame, text="Extract PDFs", command=self.extract_invoices, width=20).pack(pady=5)
+        self.upload_btn = tk.Button(frame, text="Upload PDFs", command=self.browse_files, width=20)
+        self.upload_btn.pack(pady=5)
+        self.extract_btn = tk.Button(frame, text="Extract PDFs", command=self.extract_invoices, width=20)
+        self.extract_btn.pack(pady=5)
+        self.cancel_btn = tk.Button(frame, text="Cancel", command=self.cancel_extraction, state="disabled", width=20)
+        self.cancel_btn.pack(pady=5)
         self.view_btn = tk.Button(frame, text="View Output", command=self.view_excel, state="disabled", width=20)
         self.view_btn.pack(pady=5)
 
+        self.progress = ttk.Progressbar(frame, length=300, mode="determinate")
+        self.progress.pack(pady=(10, 5))
+        self.status_var = tk.StringVar(value="")
+        tk.Label(frame, textvariable=self.status_var).pack()
+        self.rows_var = tk.StringVar(value="")
+        tk.Label(frame, textvariable=self.rows_var, justify="left").pack(pady=5)
+
     def browse_files(self):
         files = filedialog.askopenfilenames(filetypes=[("PDF files", "*.pdf")], title="Select PDF invoices")
         if files:
@@ -37,28 +64,100 @@ class InvoiceApp:
         if not self.file_paths:
             messagebox.showerror("Error", "Please select PDF files to extract.")
             return
+        if self.worker is not None and self.worker.is_alive():
+            return
 
+        self.parser = SuperHeroFlex(file_paths=self.file_paths, progress_callback=self._on_progress)
+        self.cancel_event.clear()
+        self.done = 0
+        self.started = time.perf_counter()
+        self.progress.config(maximum=len(self.file_paths), value=0)
+        self.status_var.set(f"0/{len(self.file_paths)} files")
+        self.rows_var.set("")
+        self._set_running(True)
+
+        self.worker = threading.Thread(target=self._extract_worker, args=(self.parser,), daemon=True)
+        self.worker.start()
+        self.root.after(POLL_MS, self._poll_events)
+
+    def _extract_worker(self, parser):
+        # Runs off the Tk thread: never touch widgets here, only post events
         try:
-            parser = SuperHeroFlex(file_paths=self.file_paths)
-            parser.extract_all()
-
-            output_dir = filedialog.askdirectory(title="Select Output Folder")
-            if not output_dir:
-                messagebox.showinfo("Cancelled", "No folder selected. Operation cancelled.")
+            parser.extract_all(workers=GUI_WORKERS, cancel_event=self.cancel_event)
+            self.events.put(("finished", None))
+        except Exception as e:
+            logging.getLogger(__name__).exception("Extraction failed")
+            self.events.put(("failed", e))
+
+    def _on_progress(self, pdf_file, product_type, n_rows):
+        # Called on the worker thread; snapshot the counts for the Tk side
+        self.events.put(("progress", dict(self.parser.row_counts)))
+
+    def _poll_events(self):
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self._show_progress(payload)
+            elif kind == "finished":
+                self._extraction_finished()
                 return
-
-            if not parser.results_by_product:
-                messagebox.showinfo("No Output", "No data was extracted from the uploaded PDFs.")
+            elif kind == "failed":
+                self._set_running(False)
+                self.status_var.set("Failed")
+                messagebox.showerror("Processing Error", f"An unexpected error occurred:\n{payload}")
                 return
+        self.root.after(POLL_MS, self._poll_events)
+
+    def _show_progress(self, row_counts):
+        self.done += 1
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        self.progress.config(value=self.done)
+        self.status_var.set(f"{self.done}/{len(self.file_paths)} files  ·  {rate:.1f} docs/s")
+        self.rows_var.set("\n".join(f"{product}: {rows} rows" for product, rows in sorted(row_counts.items())))
+
+    def _set_running(self, running: bool):
+        idle = "disabled" if running else "normal"
+        self.upload_btn.config(state=idle)
+        self.extract_btn.config(state=idle)
+        self.cancel_btn.config(state="normal" if running else "disabled")
+
+    def cancel_extraction(self):
+        self.cancel_event.set()
+        self.cancel_btn.config(state="disabled")
+        self.status_var.set(f"Cancelling after {self.done}/{len(self.file_paths)} files...")
+
+    def _extraction_finished(self):
+        parser = self.parser
+        self._set_running(False)
+        if parser.cancelled:
+            self.status_var.set(f"Cancelled after {self.done}/{len(self.file_paths)} files")
+
+        if not parser.results_by_product:
+            messagebox.showinfo("No Output", "No data was extracted from the uploaded PDFs.")
+            return
+
+        output_dir = filedialog.askdirectory(title="Select Output Folder")
+        if not output_dir:
+            messagebox.showinfo("Cancelled", "No folder selected. Operation cancelled.")
+            return
 
-            parser.export_by_product(Path(output_dir))
+        try:
+            parser.export_by_product(Path(output_dir), workers=GUI_WORKERS)
             self.output_file = output_dir
             self.view_btn.config(state="normal")
-            messagebox.showinfo("Success", f"Extraction completed!\nFiles saved to: {output_dir}")
-
+            note = " (partial: run was cancelled)" if parser.cancelled else ""
+            messagebox.showinfo("Success", f"Extraction completed{note}!\nFiles saved to: {output_dir}")
         except Exception as e:
             messagebox.showerror("Processing Error", f"An unexpected error occurred:\n{e}")
 
+    def on_close(self):
+        self.cancel_event.set()
+        self.root.destroy()
+
 
 
     def view_excel(self):
@@ -78,6 +177,7 @@ class InvoiceApp:
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     update.check_for_update()  # Check for updates on startup
     root = tk.Tk()
     app = InvoiceApp(root)
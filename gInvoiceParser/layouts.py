@@ -0,0 +1,56 @@
+"""
+Per-vendor layout profiles.
+
+A profile names the page regions an extractor actually reads, as relative
+bounding boxes (x0, top, x1, bottom) in fractions of the page size:
+"summary" for page 1 and "detail" for every other page. Text outside the
+box is dropped before layout analysis, so long legal footers and
+remittance blocks are never laid out and the regexes scan less text.
+A missing region (or vendor) means the whole page.
+
+Cropping is opt-in: no vendor ships with a profile, because a fixed crop
+silently drops any detail row printed inside the cropped band and the
+sample invoices don't show where real ones put their last rows. Try a
+candidate with
+`python -m gInvoiceParser parity REAL_INVOICES --backends pdfplumber:full pdfplumber --layout DV360`
+and, once it matches on every sample, enable it with register_layout() at
+module level in the application, so pool workers started by spawn (which
+re-import that module) crop the same way.
+"""
+
+# Candidate region: detail pages without the bottom band holding the legal
+# footer / page numbering. Not safe for GOOGLE_ADS, which splits account
+# blocks on the "Page N of M" footer, or SA360, which reads its total from
+# the bottom of the last page.
+NO_FOOTER = (0.0, 0.0, 1.0, 0.94)
+
+# Per-product profiles, e.g. {"DV360": {"detail": NO_FOOTER}}
+LAYOUT_PROFILES = {}
+
+
+def register_layout(product_type: str, profile: dict):
+    """Crop a product's pages to `profile` ({"summary": bbox, "detail": bbox}); None goes back to full pages."""
+    if profile:
+        LAYOUT_PROFILES[product_type] = profile
+    else:
+        LAYOUT_PROFILES.pop(product_type, None)
+
+
+def layout_for(product_type: str) -> dict:
+    """The layout profile for a product type, or None for full pages."""
+    return LAYOUT_PROFILES.get(product_type)
+
+
+def region_for(layout: dict, page_index: int):
+    """The relative bbox to extract for a 0-based page index, or None for the whole page."""
+    if not layout:
+        return None
+    return layout.get("summary" if page_index == 0 else "detail")
+
+
+def absolute_bbox(bbox, page_bbox):
+    """Scale a relative (x0, top, x1, bottom) box into a page's (x0, top, x1, bottom) coordinates."""
+    px0, ptop, px1, pbottom = page_bbox
+    width, height = px1 - px0, pbottom - ptop
+    x0, top, x1, bottom = bbox
+    return (px0 + x0 * width, ptop + top * height, px0 + x1 * width, ptop + bottom * height)
@@ -0,0 +1,132 @@
+"""
+Append-only ledger of processed files.
+
+Instead of rewriting one list object per file, every flush writes a new,
+uniquely named segment holding just the names added since the last one:
+
+    <prefix>base-<stamp>.txt       compacted names
+    <prefix>seg-<stamp>.txt        names appended by one flush
+
+Writers never touch each other's objects, so concurrent runs can't
+overwrite each other's updates. Compaction folds the bases and segments it
+has read into a new base and deletes only those, so a segment written
+meanwhile survives. Lookups go to an in-memory set loaded once per run.
+Works on any Storage (LocalStorage or GCSStorage).
+"""
+import logging
+import os
+import time
+import uuid
+
+from gInvoiceParser.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+
+def _stamp() -> str:
+    # Sorts by time; the random suffix keeps names unique across hosts and processes
+    return f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class ProcessedLedger:
+    def __init__(self, storage: Storage, prefix: str = "processed_ledger/", legacy_list: str = None,
+                 flush_every: int = 100, compact_after: int = 50):
+        self.storage = storage
+        self.prefix = prefix
+        self.legacy_list = legacy_list
+        self.flush_every = flush_every
+        self.compact_after = compact_after
+        self._names = set()
+        self._pending = []
+        self._loaded = False
+
+    def _list(self) -> list:
+        return [name for name in self.storage.list(self.prefix)
+                if name[len(self.prefix):].startswith(("base-", "seg-")) and name.endswith(".txt")]
+
+    def load(self, attempts: int = 3):
+        """Read every base and segment into memory (importing the legacy list on first use)."""
+        for attempt in range(attempts):
+            objects = self._list()
+            names = set()
+            try:
+                for name in objects:
+                    names.update(filter(None, self.storage.read_text(name).splitlines()))
+            except Exception:
+                # A concurrent compaction removed an object between listing and reading it
+                if attempt + 1 < attempts and not self.storage.exists(name):
+                    continue
+                raise
+            break
+        self._names = names | set(self._pending)
+        self._loaded = True
+        if not objects and self.legacy_list and self.storage.exists(self.legacy_list):
+            self._import_legacy()
+        return self
+
+    def _import_legacy(self):
+        names = set(filter(None, self.storage.read_text(self.legacy_list).splitlines()))
+        if not names:
+            return
+        base = f"{self.prefix}base-{_stamp()}.txt"
+        self.storage.write_text(base, "\n".join(sorted(names)))
+        self._names |= names
+        logger.info("Imported %d names from %s into the ledger", len(names), self.legacy_list)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def __contains__(self, name: str) -> bool:
+        self._ensure_loaded()
+        return name in self._names
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._names)
+
+    def add(self, name: str):
+        """Record a processed name; written out with the next flush."""
+        self._ensure_loaded()
+        if name in self._names:
+            return
+        self._names.add(name)
+        self._pending.append(name)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write the names added since the last flush as one new segment."""
+        if not self._pending:
+            return
+        segment = f"{self.prefix}seg-{_stamp()}.txt"
+        self.storage.write_text(segment, "\n".join(self._pending))
+        self._pending = []
+
+    def compact(self, force: bool = False) -> bool:
+        """
+        Fold the current bases and segments into one new base once there are
+        `compact_after` objects (or when forced). Returns True if it compacted.
+        """
+        self.flush()
+        objects = self._list()
+        if len(objects) < 2 or (not force and len(objects) < self.compact_after):
+            return False
+        names = set()
+        read = []
+        for name in objects:
+            try:
+                names.update(filter(None, self.storage.read_text(name).splitlines()))
+            except Exception:
+                if self.storage.exists(name):
+                    raise
+                # Already folded by a concurrent compaction, which kept its contents
+                continue
+            read.append(name)
+        base = f"{self.prefix}base-{_stamp()}.txt"
+        self.storage.write_text(base, "\n".join(sorted(names)))
+        for name in read:
+            self.storage.delete(name)
+        self._names |= names
+        logger.info("Compacted %d ledger objects into %s (%d names)", len(read), base, len(names))
+        return True
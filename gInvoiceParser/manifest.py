@@ -0,0 +1,234 @@
+"""
+Local manifest of processed PDFs for incremental runs.
+
+For every PDF a run has parsed, the manifest keeps its content hash,
+product type, the version of the extractor that parsed it and where its
+rows were stored. A later run over the same folder skips files that are
+unchanged (same bytes, same extractor version) and reuses their stored
+rows, so only new or modified PDFs are parsed again.
+
+Layout of the manifest directory:
+
+    manifest.json      {resolved path: entry}
+    rows/<key>.pkl     the DataFrames one PDF produced
+"""
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import pdfplumber
+
+from gInvoiceParser.backends import backend_for
+from gInvoiceParser.cache import hash_bytes
+from gInvoiceParser.extractor.patterns import PATTERN_SPECS
+from gInvoiceParser.extractor.schema import SCHEMAS
+from gInvoiceParser.layouts import layout_for
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+# Bump when stored frames change in a way none of the fingerprinted sources shows
+RESULT_FORMAT_VERSION = 1
+
+
+def _source(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # No source available (e.g. a frozen build); fall back to the bytecode
+        code = getattr(obj, "__code__", None)
+        return code.co_code.hex() if code else getattr(obj, "__name__", repr(obj))
+
+
+def _shared_sources() -> dict:
+    """Source of the code every extractor's rows pass through before they're stored."""
+    from gInvoiceParser import parser
+    from gInvoiceParser.extractor import schema, streaming
+
+    return {
+        "schema": _source(schema),
+        "streaming": _source(streaming),
+        "context": [_source(f) for f in (parser._run_extractor, parser._search_pages,
+                                         parser.extract_invoice_number, parser.extract_invoice_month)],
+    }
+
+
+def extractor_version(product_type: str, extractor) -> str:
+    """
+    Fingerprint of everything that decides an extractor's output: its module
+    source, the shared code its rows go through (RowBuilder, the streaming
+    base class, the parser's invoice-number/month context), the vendor's (and
+    common) patterns, the output schema, its layout profile, the text backend
+    (and pdfplumber) version and RESULT_FORMAT_VERSION. Any change
+    invalidates earlier results.
+    """
+    module = inspect.getmodule(extractor)
+    schema = SCHEMAS.get(product_type)
+    blob = json.dumps(
+        {
+            "format": RESULT_FORMAT_VERSION,
+            "source": _source(module) if module else _source(extractor),
+            "shared": _shared_sources(),
+            "patterns": repr(PATTERN_SPECS.get(product_type)),
+            "common": repr(PATTERN_SPECS.get("COMMON")),
+            "schema": schema.fields if schema else None,
+            "pdfplumber": pdfplumber.__version__,
+            "backend": backend_for(product_type).fingerprint,
+            "layout": layout_for(product_type),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _atomic_write(path: Path, payload: bytes):
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class Manifest:
+    FILENAME = "manifest.json"
+
+    def __init__(self, directory, autosave_every: int = 50):
+        self.directory = Path(directory)
+        self.rows_dir = self.directory / "rows"
+        self.rows_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.FILENAME
+        self.autosave_every = autosave_every
+        self.entries = self._load()
+        self._versions = {}
+        self._hashes = {}
+        self._unsaved = 0
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable manifest %s: %s", self.path, e)
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            logger.info("Manifest %s has an old format; starting fresh", self.path)
+            return {}
+        return data.get("files", {})
+
+    @staticmethod
+    def _key(pdf_file) -> str:
+        return str(Path(pdf_file).resolve())
+
+    def version_for(self, product_type: str, extractor) -> str:
+        version = self._versions.get(product_type)
+        if version is None:
+            version = self._versions[product_type] = extractor_version(product_type, extractor)
+        return version
+
+    def _content_hash(self, pdf_file, stat) -> str:
+        key = self._key(pdf_file)
+        cached = self._hashes.get(key)
+        if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+        digest = hash_bytes(Path(pdf_file).read_bytes())
+        self._hashes[key] = ((stat.st_size, stat.st_mtime_ns), digest)
+        return digest
+
+    def lookup(self, pdf_file, extractor_map: dict):
+        """The entry for pdf_file if its stored rows are still valid, else None."""
+        entry = self.entries.get(self._key(pdf_file))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(pdf_file)
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+            # Touched or copied over: only the bytes decide whether it changed
+            if self._content_hash(pdf_file, stat) != entry["sha256"]:
+                return None
+            entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            self._unsaved += 1
+
+        extractor = extractor_map.get(entry["product_type"])
+        if extractor is None or entry["extractor_version"] != self.version_for(entry["product_type"], extractor):
+            return None
+        if entry["rows_file"] and not (self.directory / entry["rows_file"]).exists():
+            return None
+        return entry
+
+    def load_rows(self, entry: dict) -> list:
+        if not entry["rows_file"]:
+            return []
+        with open(self.directory / entry["rows_file"], "rb") as fh:
+            return pickle.load(fh)
+
+    def record(self, pdf_file, product_type: str, frames: list, extractor, digest: str = None):
+        """
+        Store a freshly parsed PDF's rows and remember it as processed.
+        `digest` is the sha256 of the bytes the rows were parsed from; if the
+        file has changed since, its size and mtime aren't trusted, so the
+        next lookup re-hashes it and finds it modified.
+        """
+        key = self._key(pdf_file)
+        try:
+            stat = os.stat(pdf_file)
+            current = self._content_hash(pdf_file, stat)
+        except OSError:
+            stat = current = None
+        digest = digest or current
+        if digest is None:
+            raise FileNotFoundError(f"Cannot record {pdf_file}: it no longer exists")
+        size, mtime_ns = (stat.st_size, stat.st_mtime_ns) if current == digest else (None, None)
+
+        old = self.entries.get(key)
+        rows_file = None
+        if frames:
+            rows_name = hashlib.sha256(f"{key}\0{digest}".encode()).hexdigest()[:32]
+            rows_file = f"rows/{rows_name}.pkl"
+            _atomic_write(self.directory / rows_file, pickle.dumps(frames, protocol=pickle.HIGHEST_PROTOCOL))
+        if old and old.get("rows_file") and old["rows_file"] != rows_file:
+            (self.directory / old["rows_file"]).unlink(missing_ok=True)
+
+        self.entries[key] = {
+            "sha256": digest,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "product_type": product_type,
+            "extractor_version": self.version_for(product_type, extractor),
+            "rows_file": rows_file,
+            "rows": sum(len(df) for df in frames),
+            "processed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._unsaved += 1
+        if self._unsaved >= self.autosave_every:
+            self.save()
+
+    def prune(self) -> int:
+        """Forget PDFs that no longer exist; returns how many were dropped."""
+        missing = [key for key in self.entries if not os.path.exists(key)]
+        for key in missing:
+            rows_file = self.entries.pop(key).get("rows_file")
+            if rows_file:
+                (self.directory / rows_file).unlink(missing_ok=True)
+        if missing:
+            self._unsaved += 1
+        return len(missing)
+
+    def save(self):
+        payload = json.dumps({"version": MANIFEST_VERSION, "files": self.entries}, indent=1)
+        _atomic_write(self.path, payload.encode("utf-8"))
+        self._unsaved = 0
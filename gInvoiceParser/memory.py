@@ -0,0 +1,52 @@
+"""
+Per-document memory ceiling.
+
+Pages are extracted one at a time and their layout objects released as soon
+as the text is taken, so a document's footprint should track its largest
+page rather than its page count. MemoryCeiling checks that after every page
+and aborts a document that grows the process past the configured limit,
+instead of letting one runaway PDF take the whole batch down.
+
+Resident memory is read from /proc/self/statm; where that isn't available
+(non-Linux) the ceiling is not enforced.
+"""
+import os
+
+try:
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process, or None if it can't be read."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class DocumentMemoryError(MemoryError):
+    """A document grew the process past its memory ceiling."""
+
+
+class MemoryCeiling:
+    """Growth in resident memory allowed while one document is processed."""
+
+    def __init__(self, limit_mb: float, label: str = "document"):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self.label = label
+        self.baseline = rss_bytes()
+        self.peak = 0
+
+    def check(self, where: str = ""):
+        if self.baseline is None:
+            return
+        growth = rss_bytes() - self.baseline
+        self.peak = max(self.peak, growth)
+        if growth > self.limit:
+            raise DocumentMemoryError(
+                f"{self.label} exceeded its memory ceiling at {where or 'open'}: "
+                f"+{growth / 2**20:.0f} MB (limit {self.limit / 2**20:.0f} MB)"
+            )
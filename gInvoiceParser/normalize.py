@@ -0,0 +1,119 @@
+"""
+Vectorized normalization of extracted rows.
+
+Extractors record amounts, quantities and dates exactly as matched in the
+text. This stage turns a product's rows into typed columns with pandas
+column operations instead of float()/int() calls per row in the parse loops:
+
+- numeric columns: "$", "," and spaces stripped, "(12.00)" read as -12.00,
+  cast to the schema's Float64/Int64;
+- date columns: every vendor's date format parsed to datetime64;
+- Month: the invoice period added as PeriodStart/PeriodEnd datetimes;
+- text columns: "" becomes NA.
+
+Values that don't parse become NA/NaT. Run it once on each product's
+concatenated frame before export (or per invoice when streaming to a sink);
+normalizing a frame twice changes nothing.
+"""
+import logging
+import re
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from gInvoiceParser.extractor.schema import SCHEMAS
+
+logger = logging.getLogger(__name__)
+
+# Tried in order on dates with all whitespace removed (e.g. "Feb28,2025")
+DATE_FORMATS = ("%b%d,%Y", "%B%d,%Y", "%d-%b-%Y", "%m/%d/%Y", "%Y-%m-%d")
+# Single-month periods such as "January 2025"
+MONTH_FORMATS = ("%B%Y", "%b%Y")
+
+PERIOD_COLUMNS = ("PeriodStart", "PeriodEnd")
+
+_NUMBER_NOISE = re.compile(r"[$,\s]")
+_PARENTHESISED = re.compile(r"^\((.*)\)$")
+_WHITESPACE = re.compile(r"\s+")
+_RANGE_SEPARATOR = re.compile(r"\s+-\s+")
+
+
+def _text(values: pd.Series) -> pd.Series:
+    return values.astype("string").str.strip()
+
+
+def _report(values: pd.Series, parsed: pd.Series, column: str, product_type: str):
+    failed = int((parsed.isna() & values.notna() & (values != "")).sum())
+    if failed:
+        logger.warning("%d %s value(s) in %r could not be parsed", failed, product_type or "", column,
+                       extra={"product_type": product_type})
+
+
+def to_number(values: pd.Series, dtype: str = "Float64", column: str = None, product_type: str = None) -> pd.Series:
+    """Currency text to a nullable number column (Float64 or Int64)."""
+    if is_numeric_dtype(values.dtype):
+        return values.astype(dtype)
+    text = _text(values)
+    cleaned = text.str.replace(_NUMBER_NOISE, "", regex=True).str.replace(_PARENTHESISED, r"-\1", regex=True)
+    numbers = pd.to_numeric(cleaned.mask(cleaned == ""), errors="coerce").astype("Float64")
+    if dtype == "Int64":
+        numbers = numbers.where(numbers % 1 == 0)
+    _report(text, numbers, column, product_type)
+    return numbers.astype(dtype)
+
+
+def to_datetime(values: pd.Series, formats=DATE_FORMATS, column: str = None, product_type: str = None,
+                report: bool = True) -> pd.Series:
+    """Date text in any of `formats` to a datetime64 column (NaT where none matches)."""
+    if is_datetime64_any_dtype(values.dtype):
+        return values
+    text = _text(values).str.replace(_WHITESPACE, "", regex=True)
+    text = text.mask(text == "")
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        missing = result.isna() & text.notna()
+        if not missing.any():
+            break
+        result[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+    if report:
+        _report(text, result, column, product_type)
+    return result
+
+
+def to_period(values: pd.Series) -> tuple:
+    """
+    (start, end) datetime columns for invoice periods, written either as a
+    range ("Jan 1, 2025 - Jan 31, 2025") or as a month ("January 2025").
+    """
+    parts = _text(values).str.split(_RANGE_SEPARATOR, n=1, expand=True, regex=True)
+    start = to_datetime(parts[0], report=False)
+    end = to_datetime(parts[1], report=False) if parts.shape[1] > 1 else start.where(start.isna())
+    month = to_datetime(parts[0].where(start.isna()), MONTH_FORMATS, report=False)
+    return start.fillna(month), end.fillna(month + pd.offsets.MonthEnd(0))
+
+
+def normalize_frame(df: pd.DataFrame, product_type: str) -> pd.DataFrame:
+    """A copy of one product's rows with every column cast to its schema dtype."""
+    schema = SCHEMAS.get(product_type)
+    dtypes = schema.dtypes if schema else {}
+    columns = {}
+    for column, values in df.items():
+        dtype = dtypes.get(column)
+        if dtype in ("Float64", "Int64"):
+            columns[column] = to_number(values, dtype, column, product_type)
+        elif dtype is not None and dtype.startswith("datetime64"):
+            columns[column] = to_datetime(values, column=column, product_type=product_type)
+        elif values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+            columns[column] = values.mask((values == "").fillna(False))
+        else:
+            columns[column] = values
+    if "Month" in df.columns and not any(column in df.columns for column in PERIOD_COLUMNS):
+        columns.update(zip(PERIOD_COLUMNS, to_period(df["Month"])))
+    return pd.DataFrame(columns, index=df.index)
+
+
+def normalize_frames(product_type: str, frames: list) -> pd.DataFrame:
+    """Concatenate one product's frames and normalize them in a single pass."""
+    if not frames:
+        return pd.DataFrame()
+    return normalize_frame(pd.concat(frames, ignore_index=True), product_type)
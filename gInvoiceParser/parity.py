@@ -0,0 +1,78 @@
+"""
+Text-backend parity check.
+
+Runs every extractor on the same PDFs with each text backend and reports,
+per product, whether the rows come out identical to the reference backend
+(the first one given) and how long each backend spent extracting text.
+A product is safe to move to a faster backend once all its samples match.
+
+A backend given as "NAME:full" ignores the vendors' layout profiles, so
+`--backends pdfplumber:full pdfplumber` checks that cropping to a profile
+leaves the rows unchanged.
+"""
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from gInvoiceParser.backends import get_backend
+from gInvoiceParser.normalize import normalize_frames
+from gInvoiceParser.parser import extractor_map, process_pdf
+from gInvoiceParser.timing import StageTimer
+
+
+def _frame(product_type: str, frames: list) -> pd.DataFrame:
+    # Compared as they would be exported
+    return normalize_frames(product_type, frames)
+
+
+def _difference(reference: pd.DataFrame, other: pd.DataFrame) -> str:
+    """A short description of the first difference between two result frames, or None."""
+    if list(reference.columns) != list(other.columns):
+        return f"columns {list(reference.columns)} vs {list(other.columns)}"
+    if len(reference) != len(other):
+        return f"{len(reference)} rows vs {len(other)}"
+    for column in reference.columns:
+        left = reference[column].astype("string")
+        right = other[column].astype("string")
+        differs = ~((left == right).fillna(False) | (left.isna() & right.isna()))
+        if differs.any():
+            row = int(differs.to_numpy().nonzero()[0][0])
+            return f"{column!r} row {row}: {left.iloc[row]!r} vs {right.iloc[row]!r}"
+    return None
+
+
+def compare_backends(pdf_files, backends=("pdfplumber", "pypdfium2"), extractor_map=extractor_map) -> dict:
+    """
+    Returns {product_type: {"files", "matching", "mismatches": [{"file", "backend", "reason"}],
+    "text_seconds": {backend: seconds}}}, keyed by the reference backend's product type.
+    """
+    variants = []
+    for spec in backends:
+        name, _, mode = spec.partition(":")
+        variants.append((spec, get_backend(name), mode != "full"))
+    report = defaultdict(lambda: {"files": 0, "matching": 0, "mismatches": [],
+                                  "text_seconds": dict.fromkeys((spec for spec, _, _ in variants), 0.0)})
+    for pdf_file in pdf_files:
+        results = []
+        for spec, backend, layouts in variants:
+            timer = StageTimer()
+            product_type, frames = process_pdf(pdf_file, extractor_map, timer=timer, backend=backend,
+                                               layouts=layouts)
+            results.append((spec, product_type, _frame(product_type, frames), timer.seconds))
+
+        reference_product = results[0][1]
+        entry = report[reference_product]
+        entry["files"] += 1
+        matching = True
+        for name, product_type, frame, seconds in results:
+            entry["text_seconds"][name] += seconds["open"] + seconds["text"]
+            if product_type != reference_product:
+                reason = f"identified as {product_type} instead of {reference_product}"
+            else:
+                reason = _difference(results[0][2], frame)
+            if reason:
+                matching = False
+                entry["mismatches"].append({"file": str(Path(pdf_file)), "backend": name, "reason": reason})
+        entry["matching"] += matching
+    return dict(report)
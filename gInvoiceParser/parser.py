@@ -1,14 +1,33 @@
 from pathlib import Path
+import logging
+import os
 import re
-import pdfplumber
 import pandas as pd
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from gInvoiceParser.extractor.dv360 import extract_dv360
 from gInvoiceParser.extractor.cm360 import extract_cm360
 from gInvoiceParser.extractor.google_ads import extract_google_ads
 from gInvoiceParser.extractor.linkedin import extract_linkedin
 from gInvoiceParser.extractor.google_workspace import extract_google_workspace
 from gInvoiceParser.extractor.sa360 import extract_sa360
+from gInvoiceParser.extractor.patterns import PATTERNS
+from gInvoiceParser.backends import TextBackend, backend_for, get_backend
+from gInvoiceParser.cache import TextCache, hash_bytes
+from gInvoiceParser.classifier import classify
+from gInvoiceParser.document import InvoiceDocument, LazyTextDict, as_document
+from gInvoiceParser.export import write_workbooks
+from gInvoiceParser.layouts import layout_for, region_for
+from gInvoiceParser.manifest import Manifest
+from gInvoiceParser.memory import DocumentMemoryError, MemoryCeiling
+from gInvoiceParser.normalize import normalize_frame, normalize_frames
+from gInvoiceParser.results import ResultCache
+from gInvoiceParser.sinks import ResultSink, output_stem
+from gInvoiceParser.timing import BatchTimings, StageTimer, timed
+
+logger = logging.getLogger(__name__)
 
 extractor_map = {
     "CM360": extract_cm360,
@@ -19,101 +38,571 @@ extractor_map = {
     "SA360": extract_sa360,
 }
 
-def build_text_dict(pdf):
-    return {f"page_{i + 1}": {"text": page.extract_text()} for i, page in enumerate(pdf.pages)}
+# Keyword arguments passed to pdfplumber's page.extract_text(); part of the text cache key
+TEXT_EXTRACTION_SETTINGS = {}
+
+# Pages scanned for a product signature when page 1 alone doesn't settle the vendor
+CLASSIFY_PAGE_LIMIT = 3
+
+def _memory_ceiling(pdf_file, memory_limit_mb: float = None):
+    if not memory_limit_mb:
+        return None
+    return MemoryCeiling(memory_limit_mb, Path(pdf_file).name)
+
+def iter_page_texts(pdf, settings: dict = None, memory: MemoryCeiling = None):
+    """
+    Yield (key, text) for each page of an open pdfplumber PDF, releasing the
+    page's parsed objects as soon as its text is taken.
+    """
+    settings = TEXT_EXTRACTION_SETTINGS if settings is None else settings
+    for i, page in enumerate(pdf.pages):
+        try:
+            text = page.extract_text(**settings)
+        finally:
+            page.close()
+        if memory is not None:
+            memory.check(f"page_{i + 1}")
+        yield f"page_{i + 1}", text
+
+def build_text_dict(pdf, settings: dict = None):
+    """Eagerly extract every page of an open pdfplumber PDF."""
+    return {key: {"text": text} for key, text in iter_page_texts(pdf, settings)}
+
+@contextmanager
+def open_text_dict(pdf_file, text_cache: TextCache = None, timer: StageTimer = None,
+                   backend: TextBackend = None, layout: dict = None, pages: dict = None, data: bytes = None,
+                   memory_limit_mb: float = None):
+    """
+    Yield a LazyTextDict for a PDF. With a text cache, previously extracted
+    pages are served from the cache and newly extracted ones are written through
+    to it as they are extracted.
+    Reading, closing and cache I/O are charged to the timer's "open" stage.
+    `layout` crops pages to a vendor profile's regions; `pages` seeds text
+    that is already known (e.g. page 1 read while classifying). With `data`
+    the PDF is read from those bytes and `pdf_file` only names it.
+    `memory_limit_mb` is the most the document may grow this process's
+    resident memory (None = no limit).
+    """
+    backend = backend or get_backend()
+    memory = _memory_ceiling(pdf_file, memory_limit_mb)
+    if text_cache is None:
+        source = pdf_file if data is None else data
+        text_dict = LazyTextDict(source, TEXT_EXTRACTION_SETTINGS, pages=pages, timer=timer,
+                                 backend=backend, layout=layout, memory=memory)
+        try:
+            yield text_dict
+        finally:
+            with timed(timer, "open"):
+                text_dict.close()
+        return
+
+    with timed(timer, "open"):
+        pdf_bytes = Path(pdf_file).read_bytes() if data is None else data
+        settings = {**TEXT_EXTRACTION_SETTINGS, "layout": layout} if layout else TEXT_EXTRACTION_SETTINGS
+        key = text_cache.key_for(pdf_bytes, settings, backend.fingerprint)
+        entry = text_cache.get(key) or {}
+    cached_pages = entry.get("pages", {})
+    # Newly extracted pages are written through as they come, so streamed ones aren't kept for the cache
+    writer = text_cache.writer(key)
+    text_dict = LazyTextDict(
+        pdf_bytes, TEXT_EXTRACTION_SETTINGS,
+        pages={**(pages or {}), **cached_pages}, page_count=entry.get("page_count"), timer=timer,
+        backend=backend, layout=layout, memory=memory, on_extract=writer.add,
+    )
+    try:
+        yield text_dict
+    finally:
+        with timed(timer, "open"):
+            text_dict.close()
+            if writer.written or len(text_dict.extracted) > len(cached_pages):
+                # Complete the entry with the pages that were already known
+                for page_key, page in text_dict.extracted.items():
+                    writer.add(page_key, page)
+                writer.commit(text_dict.page_count)
+            else:
+                writer.abort()
+
+def _search_pages(doc: InvoiceDocument, pattern: re.Pattern):
+    # Page 1 carries the invoice header, so only fall back to the full text when it misses
+    match = pattern.search(doc.summary_text)
+    if match is None and len(doc) > 1:
+        match = pattern.search(doc.full_text)
+    return match
 
 def extract_invoice_number(text_dict):
-    full_text = "\n".join(p.get("text", "") for p in text_dict.values())
-    match = re.search(r"Invoice number[:\s]*([0-9]{7,})", full_text, re.IGNORECASE)
+    match = _search_pages(as_document(text_dict), PATTERNS["COMMON"]["invoice_number"])
     return match.group(1) if match else None
 
 def extract_invoice_month(text_dict):
-    full_text = "\n".join(p.get("text", "") for p in text_dict.values())
-    match = re.search(r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},\s+\d{4}\s*[-\u2013]\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},\s+\d{4}", full_text)
+    match = _search_pages(as_document(text_dict), PATTERNS["COMMON"]["invoice_month"])
     return match.group(0) if match else None
 
+def identify_product(text_dict) -> str:
+    # Classify from page 1 and only look a few pages further if that is inconclusive,
+    # so an unrecognised document is never fully extracted.
+    return classify(text_dict, CLASSIFY_PAGE_LIMIT)[0]
+
+def _log_context(pdf_file, product_type=None) -> dict:
+    # Attached to log records as `extra`; "filename" itself is a reserved LogRecord attribute
+    return {"pdf_filename": Path(pdf_file).name, "product_type": product_type}
+
+def process_pdf(pdf_file, extractor_map=extractor_map, text_cache: TextCache = None,
+                timer: StageTimer = None, errors: list = None, backend: TextBackend = None,
+                layouts: bool = True, data: bytes = None, memory_limit_mb: float = None):
+    """
+    Open, text-extract and parse a single PDF.
+    Returns (product_type, [DataFrame, ...]); kept at module level so it can
+    run inside a process pool worker. Pass a StageTimer to collect per-stage
+    timings, and a list as `errors` to receive the messages of any failures
+    that were logged and swallowed. `backend` forces one text backend for
+    the whole document instead of the configured per-product one, and
+    `layouts=False` extracts full pages instead of the vendor's layout profile.
+    Pass the PDF's bytes as `data` to parse it without reading `pdf_file`,
+    which then only names the document. `memory_limit_mb` fails a document
+    that grows the process by more than that many MB.
+    """
+    errors = [] if errors is None else errors
+    pdf_file = Path(pdf_file)
+    product_type = None
+    frames = []
+    try:
+        with open_text_dict(pdf_file, text_cache, timer, backend, data=data,
+                            memory_limit_mb=memory_limit_mb) as text_dict:
+            doc = InvoiceDocument(text_dict, str(pdf_file))
+            with timed(timer, "identify"):
+                product_type, confidence = classify(doc, CLASSIFY_PAGE_LIMIT)
+            logger.debug("Classified %s as %s (confidence %.2f)", pdf_file.name, product_type, confidence,
+                         extra=_log_context(pdf_file, product_type))
+            extractor = extractor_map.get(product_type)
+            if not extractor:
+                logger.warning("No extractor found for %s (%s)", pdf_file.name, product_type,
+                               extra=_log_context(pdf_file, product_type))
+                return product_type, frames
+
+            backend = backend or backend_for(product_type)
+            layout = layout_for(product_type) if layouts else None
+            if backend is text_dict.backend and not layout:
+                with timed(timer, "extract"):
+                    _run_extractor(extractor, doc, pdf_file, product_type, frames, errors)
+                return product_type, frames
+            seed = None
+            if backend is text_dict.backend and not region_for(layout, 0):
+                # Page 1 is read uncropped either way, so keep the text classification extracted
+                seed = {key: entry for key, entry in text_dict.extracted.items() if key == "page_1"}
+
+        # The product has its own text backend or layout profile: reopen with it
+        with open_text_dict(pdf_file, text_cache, timer, backend, layout, seed, data,
+                            memory_limit_mb) as text_dict:
+            doc = InvoiceDocument(text_dict, str(pdf_file))
+            with timed(timer, "extract"):
+                _run_extractor(extractor, doc, pdf_file, product_type, frames, errors)
+    except Exception as e:
+        logger.critical("Failed processing %s: %s", pdf_file, e,
+                        exc_info=True, extra=_log_context(pdf_file, product_type))
+        errors.append(f"Failed processing: {e}")
+    return product_type, frames
+
+def _run_extractor(extractor, doc: InvoiceDocument, pdf_file: Path, product_type: str, frames: list,
+                   errors: list):
+    """Build the invoice context, run the vendor extractor and append its non-empty frames."""
+    context = {
+        "invoice_num": extract_invoice_number(doc),
+        "invoice_month": extract_invoice_month(doc),
+        "doc": doc,
+    }
+
+    # SA360 override
+    if product_type == "SA360":
+        match = _search_pages(doc, PATTERNS["SA360"]["invoice_number"])
+        if match:
+            context["invoice_num"] = match.group(1)
+        month_match = _search_pages(doc, PATTERNS["SA360"]["month"])
+        if month_match:
+            context["invoice_month"] = month_match.group(1)
+
+    try:
+        df = extractor(
+            context["doc"],
+            context["invoice_num"] or "",
+            str(pdf_file),
+            context["invoice_month"] or "",
+        )
+        if isinstance(df, tuple):
+            for d in df:
+                if isinstance(d, pd.DataFrame) and not d.empty:
+                    frames.append(d)
+        elif isinstance(df, pd.DataFrame) and not df.empty:
+            frames.append(df)
+        else:
+            logger.info("No rows returned for %s (%s)", pdf_file.name, product_type,
+                        extra=_log_context(pdf_file, product_type))
+    except DocumentMemoryError:
+        # Fails the whole document, not just this extractor
+        raise
+    except Exception as e:
+        logger.error("Extractor failed for %s (%s): %s", pdf_file.name, product_type, e,
+                     exc_info=True, extra=_log_context(pdf_file, product_type))
+        errors.append(f"{product_type} extractor failed: {e}")
+
+def process_pdf_job(pdf_file, extractor_map=extractor_map, text_cache: TextCache = None, data: bytes = None,
+                    memory_limit_mb: float = None):
+    """
+    process_pdf as run by SuperHeroFlex, returning
+    (product_type, frames, {stage: seconds}, [error, ...], sha256).
+    The PDF is read once and parsed from those bytes, so sha256 is the hash
+    of exactly the content the rows came from (None if it couldn't be read).
+    The memory limit is an argument rather than a setting, so it reaches
+    pool workers however they are started (fork, spawn or forkserver).
+    """
+    timer = StageTimer()
+    errors = []
+    if data is None:
+        try:
+            with timed(timer, "open"):
+                data = Path(pdf_file).read_bytes()
+        except OSError as e:
+            logger.critical("Failed processing %s: %s", pdf_file, e, extra=_log_context(pdf_file))
+            return None, [], timer.seconds, [f"Failed processing: {e}"], None
+    product_type, frames = process_pdf(pdf_file, extractor_map, text_cache, timer, errors, data=data,
+                                       memory_limit_mb=memory_limit_mb)
+    return product_type, frames, timer.seconds, errors, hash_bytes(data)
+
+def _file_size(path) -> int:
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+def iter_pdf_files(root, recursive: bool = False):
+    """
+    Yield the PDFs under root in name order, one directory listing at a
+    time, descending into subfolders when recursive.
+    """
+    pending = [Path(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning("Cannot read directory %s: %s", directory, e)
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                yield Path(entry.path)
+        if recursive:
+            pending.extend(reversed(subdirs))
+
 class SuperHeroFlex:
-    def __init__(self, pdf_dir: str = None, file_paths: list[str] = None):
+    def __init__(self, pdf_dir: str = None, file_paths: list[str] = None, text_cache: TextCache = None,
+                 sink: ResultSink = None, timing_callback=None, recursive: bool = False,
+                 progress_callback=None, manifest: Manifest = None, dedup: bool = False,
+                 result_cache: ResultCache = None, memory_limit_mb: float = None):
         self.pdf_dir = Path(pdf_dir) if pdf_dir else None
+        self.recursive = recursive
         self.file_paths = [Path(p) for p in file_paths] if file_paths else []
         if not self.pdf_dir and not self.file_paths:
             raise ValueError("Must provide either a pdf_dir or file_paths.")
         self.results_by_product = defaultdict(list)
         self.extractor_map = extractor_map
+        self.text_cache = text_cache
+        # With a sink, rows are streamed out per invoice instead of kept in results_by_product
+        self.sink = sink
+        self.row_counts = Counter()
+        # Documents that failed ({path: [error, ...]}) or matched no extractor
+        self.failures = {}
+        self.unrecognized = []
+        # Per-stage seconds for the run; timing_callback(pdf_file, product_type, seconds)
+        # is also called as each document finishes (pdf_file is None for export)
+        self.timings = BatchTimings()
+        self.timing_callback = timing_callback
+        # progress_callback(pdf_file, product_type, n_rows) after each document is collected
+        self.progress_callback = progress_callback
+        self.cancelled = False
+        # With a manifest, unchanged PDFs are skipped and their stored rows reused
+        # (or, when the sink appends to earlier output, not written again)
+        self.manifest = manifest
+        self.skipped = []
+        # With a result cache, PDFs parsed before (anywhere, by the same extractor
+        # version) reuse the cached rows; those files are listed in self.cached
+        self.result_cache = result_cache
+        self.cached = []
+        self._digests = {}
+        # With dedup, re-sent copies of an invoice are dropped before extraction
+        # and listed here as {"file", "duplicate_of", "reason"}
+        self.dedup = dedup
+        self.duplicates = []
+        # Fail any document that grows a worker's resident memory by more than this many MB
+        self.memory_limit_mb = memory_limit_mb
+
+    def extract_all(self, workers: int = 1, cancel_event=None):
+        """
+        Extract every PDF and collect the resulting DataFrames by product, or
+        hand them to self.sink as each invoice finishes.
+        With workers > 1 whole documents are spread across a process pool;
+        results are still merged in input order so output is deterministic.
+        Setting `cancel_event` (a threading.Event) stops the run after the
+        documents in flight; everything collected so far is kept.
+        """
+        self.cancelled = False
+        self.skipped = []
+        self.cached = []
+        pdf_files = self.iter_pdf_files()
+        if self.dedup:
+            pdf_files = self._drop_duplicates(pdf_files, workers)
+        parallel = workers and workers > 1
+        if parallel:
+            pdf_files = list(pdf_files)
+        if parallel and len(pdf_files) > 1:
+            results = self._extract_parallel(pdf_files, workers, cancel_event)
+        else:
+            results = self._extract_serial(pdf_files, cancel_event)
+
+        try:
+            for pdf_file, result in results:
+                self.add_result(pdf_file, result)
+        finally:
+            if self.manifest is not None:
+                self.manifest.save()
+        self.cancelled = cancel_event is not None and cancel_event.is_set()
+        if self.cancelled:
+            logger.warning("Extraction cancelled after %d document(s)", len(self.timings.documents))
 
-    def extract_all(self):
-        pdf_list = self.file_paths or list(self.pdf_dir.glob("*.pdf"))
-        for pdf_file in pdf_list:
+    def add_result(self, pdf_file, result):
+        """Collect one process_pdf_job result: count, store or stream its rows, report progress."""
+        product_type, frames, seconds, errors, _ = result
+        self._collect(pdf_file, product_type, frames, seconds, errors)
+        if self.progress_callback is not None:
+            self.progress_callback(pdf_file, product_type, sum(len(df) for df in frames))
+
+    def _drop_duplicates(self, pdf_files, workers: int = 1) -> list:
+        from gInvoiceParser.dedup import find_duplicates
+
+        start = perf_counter()
+        unique, self.duplicates = find_duplicates(pdf_files, self.text_cache, workers or 1)
+        for duplicate in self.duplicates:
+            logger.info("Skipping %s: duplicate of %s (%s)", Path(duplicate["file"]).name,
+                        Path(duplicate["duplicate_of"]).name, duplicate["reason"],
+                        extra=_log_context(duplicate["file"]))
+        logger.debug("Dedup checked %d files in %.2fs", len(unique) + len(self.duplicates), perf_counter() - start)
+        return unique
+
+    def iter_pdf_files(self):
+        """The explicit file_paths, or else the PDFs found under pdf_dir."""
+        if self.file_paths:
+            return iter(self.file_paths)
+        return iter_pdf_files(self.pdf_dir, self.recursive)
+
+    def _collect(self, pdf_file, product_type: str, frames: list, seconds: dict, errors: list):
+        if errors:
+            self.failures[str(pdf_file)] = errors
+        elif product_type not in self.extractor_map:
+            self.unrecognized.append(str(pdf_file))
+        start = perf_counter()
+        for df in frames:
+            self.row_counts[product_type] += len(df)
+            if self.sink is not None:
+                # Streamed rows can't wait for the whole product, so each invoice is normalized on its own
+                self.sink.write(product_type, normalize_frame(df, product_type))
+            else:
+                self.results_by_product[product_type].append(df)
+        if self.sink is not None:
+            seconds = {**seconds, "export": seconds.get("export", 0.0) + perf_counter() - start}
+        self._record_timing(pdf_file, product_type, seconds)
+
+    def _record_timing(self, pdf_file, product_type: str, seconds: dict):
+        self.timings.record(str(pdf_file) if pdf_file is not None else None, product_type, seconds)
+        if logger.isEnabledFor(logging.DEBUG) and pdf_file is not None:
+            logger.debug("Stage timings for %s: %s", Path(pdf_file).name,
+                         ", ".join(f"{stage}={s * 1000:.1f}ms" for stage, s in seconds.items()),
+                         extra=_log_context(pdf_file, product_type))
+        if self.timing_callback is not None:
+            self.timing_callback(pdf_file, product_type, seconds)
+
+    def stored_result(self, pdf_file):
+        """The stored result for an unchanged or already parsed PDF, or None if it needs parsing."""
+        return self.stored_results([pdf_file])[0]
+
+    def stored_results(self, pdf_files: list) -> list:
+        """stored_result for many PDFs, reading cached rows in bulk."""
+        results = [self._manifest_result(pdf_file) for pdf_file in pdf_files]
+        if self.result_cache is not None:
+            misses = [i for i, result in enumerate(results) if result is None]
+            for i, result in zip(misses, self._cached_results([pdf_files[i] for i in misses])):
+                results[i] = result
+        return results
+
+    def _manifest_result(self, pdf_file):
+        if self.manifest is None:
+            return None
+        entry = self.manifest.lookup(pdf_file, self.extractor_map)
+        if entry is None:
+            return None
+        if self.sink is not None and self.sink.append:
+            # Its rows went to this output on the run that parsed it; appending them again duplicates them
+            self.skipped.append(str(pdf_file))
+            return entry["product_type"], [], {}, [], entry["sha256"]
+        try:
+            frames = self.manifest.load_rows(entry)
+        except Exception as e:
+            logger.warning("Could not load stored rows for %s, re-parsing: %s", Path(pdf_file).name, e)
+            return None
+        self.skipped.append(str(pdf_file))
+        return entry["product_type"], frames, {}, [], entry["sha256"]
+
+    def _digest(self, pdf_file) -> str:
+        key = str(pdf_file)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = hash_bytes(Path(pdf_file).read_bytes())
+        return digest
+
+    def _cached_results(self, pdf_files: list) -> list:
+        hits = []
+        for i, pdf_file in enumerate(pdf_files):
+            try:
+                digest = self._digest(pdf_file)
+            except OSError:
+                continue
+            product_type = self.result_cache.lookup(digest, self.extractor_map)
+            if product_type is not None:
+                hits.append((i, (digest, product_type, self.extractor_map[product_type], pdf_file)))
+        results = [None] * len(pdf_files)
+        loaded = self.result_cache.get_many([request for _, request in hits])
+        for (i, (digest, product_type, extractor, pdf_file)), frames in zip(hits, loaded):
+            if frames is None:
+                continue
+            self.cached.append(str(pdf_file))
+            if self.manifest is not None:
+                self.manifest.record(pdf_file, product_type, frames, extractor, digest)
+            results[i] = product_type, frames, {}, [], digest
+        return results
+
+    def remember_result(self, pdf_file, result):
+        # Only successful, recognised documents are recorded (the rest are retried next run),
+        # keyed by the hash of the bytes that were parsed rather than what the file holds now
+        product_type, frames, _, errors, digest = result
+        extractor = self.extractor_map.get(product_type)
+        if extractor is None or errors or digest is None:
+            return result
+        if self.manifest is not None:
+            self.manifest.record(pdf_file, product_type, frames, extractor, digest)
+        if self.result_cache is not None:
             try:
-                with pdfplumber.open(pdf_file) as pdf:
-                    text_dict = build_text_dict(pdf)
-
-                context = {
-                    "invoice_num": extract_invoice_number(text_dict),
-                    "invoice_month": extract_invoice_month(text_dict),
-                    "text_dict": text_dict,
-                }
-
-                product_type = self.identify_product(text_dict)
-
-                # SA360 override
-                if product_type == "SA360":
-                    full_text = "\n".join(p.get("text", "") for p in text_dict.values())
-                    match = re.search(r"INVOICE\s+#?:?\s*(\d{5,})", full_text, re.IGNORECASE)
-                    if match:
-                        context["invoice_num"] = match.group(1)
-                    month_match = re.search(r'Search Ads 360\s*[-\u2013]\s*(\w+\s+\d{4})', full_text, re.IGNORECASE)
-                    if month_match:
-                        context["invoice_month"] = month_match.group(1)
-
-                extractor = self.get_extractor(product_type)
-                if extractor:
+                self.result_cache.put(digest, product_type, frames, extractor, pdf_file)
+            except Exception as e:
+                logger.warning("Could not cache rows for %s: %s", Path(pdf_file).name, e)
+        return result
+
+    def _extract_serial(self, pdf_files, cancel_event=None):
+        for pdf_file in pdf_files:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            result = self.stored_result(pdf_file)
+            if result is None:
+                result = process_pdf_job(pdf_file, self.extractor_map, self.text_cache,
+                                         memory_limit_mb=self.memory_limit_mb)
+                result = self.remember_result(pdf_file, result)
+            yield pdf_file, result
+
+    def _extract_parallel(self, pdf_list, workers: int, cancel_event=None):
+        # Results go out in input order, so only the `workers * 2` documents from
+        # the oldest unfinished one on are parsed or held at once; a small first
+        # file can't make the whole batch's rows pile up in memory. Within that
+        # window the largest unstarted file goes to the next free worker, so long
+        # documents start as early as the window allows.
+        window = workers * 2
+        lookahead = []  # (size, -index) of window documents not yet submitted
+        finished = {}
+        futures = {}
+        next_index = 0
+        admitted = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                if not cancelled:
+                    end = min(len(pdf_list), next_index + window)
+                    if admitted < end:
+                        batch = range(admitted, end)
+                        stored = self.stored_results([pdf_list[i] for i in batch])
+                        for index, result in zip(batch, stored):
+                            if result is not None:
+                                finished[index] = result
+                            else:
+                                lookahead.append((_file_size(pdf_list[index]), -index))
+                        lookahead.sort()
+                        admitted = end
+                    while lookahead and len(futures) < workers:
+                        index = -lookahead.pop()[1]
+                        future = pool.submit(process_pdf_job, pdf_list[index], self.extractor_map,
+                                             self.text_cache, memory_limit_mb=self.memory_limit_mb)
+                        futures[future] = index
+
+                # Hand results back in input order, not completion order
+                while next_index in finished:
+                    yield pdf_list[next_index], finished.pop(next_index)
+                    next_index += 1
+                if cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    # Keep documents that already finished behind a gap in the order
+                    for index in sorted(finished):
+                        yield pdf_list[index], finished[index]
+                    return
+                if not futures:
+                    if next_index >= len(pdf_list):
+                        return
+                    continue
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures.pop(future)
                     try:
-                        df = extractor(
-                            context["text_dict"],
-                            context["invoice_num"] or "",
-                            str(pdf_file),
-                            context["invoice_month"] or "",
-                        )
-                        if isinstance(df, tuple):
-                            for d in df:
-                                if isinstance(d, pd.DataFrame) and not d.empty:
-                                    self.results_by_product[product_type].append(d)
-                        elif isinstance(df, pd.DataFrame) and not df.empty:
-                            self.results_by_product[product_type].append(df)
-                        else:
-                            print(f"[INFO] No rows returned for {pdf_file.name} ({product_type})")
+                        finished[index] = self.remember_result(pdf_list[index], future.result())
                     except Exception as e:
-                        print(f"[ERROR] Extractor failed for {pdf_file.name}: {e}")
-                else:
-                    print(f"[WARNING] No extractor found for {pdf_file.name}")
-            except Exception as e:
-                print(f"[CRITICAL] Failed processing {pdf_file}: {e}")
+                        logger.critical("Failed processing %s: %s", pdf_list[index], e,
+                                        extra=_log_context(pdf_list[index]))
+                        finished[index] = (None, [], {}, [f"Failed processing: {e}"], None)
 
-    def export_by_product(self, output_dir: Path):
+    def export_by_product(self, output_dir: Path, workers: int = 1, single_workbook: bool = False) -> dict:
+        """
+        Write the results as streamed XLSX and return {product_type: path}:
+        one workbook per product (up to `workers` written at once), or with
+        `single_workbook` one workbook for the run with a sheet per product.
+        Each product's rows are concatenated and normalized once first.
+        """
+        output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
-        for product_type, dfs in self.results_by_product.items():
-            df = pd.concat(dfs, ignore_index=True)
-            output_path = output_dir / f"{product_type.lower().replace(' ', '_')}_invoices.xlsx"
-            df.to_excel(output_path, index=False)
-            print(f"[EXPORT] {product_type}: {len(df)} rows → {output_path}")
+        start = perf_counter()
+        products = {product_type: [normalize_frames(product_type, dfs)]
+                    for product_type, dfs in self.results_by_product.items()}
+        normalize_seconds = (perf_counter() - start) / max(1, len(products))
+        if single_workbook:
+            output_path = output_dir / f"{output_stem('all')}.xlsx"
+            jobs = {output_path: products}
+            outputs = dict.fromkeys(products, output_path)
+        else:
+            outputs = {product_type: output_dir / f"{output_stem(product_type)}.xlsx" for product_type in products}
+            jobs = {outputs[product_type]: {"Sheet1": dfs} for product_type, dfs in products.items()}
+
+        written = write_workbooks(jobs, workers)
+        for product_type, output_path in outputs.items():
+            rows, seconds = written[output_path]
+            if single_workbook:
+                # One file for every product: split its time by row count
+                rows = sum(len(df) for df in products[product_type])
+                seconds = seconds * rows / max(1, written[output_path][0])
+            self._record_timing(None, product_type, {"export": seconds + normalize_seconds})
+            logger.info("Exported %s: %d rows → %s", product_type, rows, output_path,
+                        extra={"product_type": product_type})
+        return outputs
 
     def identify_product(self, text_dict) -> str:
-        full_text = "\n".join(p.get("text", "") for p in text_dict.values())
-        if "Campaign Manager 360" in full_text:
-            return "CM360"
-        elif "Google Ads" in full_text:
-            return "GOOGLE_ADS"
-        elif "Google Workspace" in full_text:
-            return "GOOGLE_WORKSPACE"
-        elif "LinkedIn" in full_text:
-            return "LINKEDIN"
-        elif "Display and Video 360" in full_text or "Display & Video 360" in full_text:
-            return "DV360"
-        elif "Search Ads 360" in full_text:
-            return "SA360"
-        else:
-            return "UNKNOWN"
+        return identify_product(text_dict)
 
     def get_extractor(self, product_type):
         return self.extractor_map.get(product_type)
@@ -0,0 +1,194 @@
+"""
+Storage-to-storage batch pipeline.
+
+Invoices are read from an ingest Storage, parsed, and their rows written as
+one CSV per product to an output Storage; every parsed PDF is moved to the
+processed prefix and recorded in the processed-file ledger. The work runs
+as three overlapping stages:
+
+    download (I/O threads) -> parse (process pool, from bytes) -> move (I/O threads)
+
+At most `max_in_flight` invoices are downloaded-but-not-parsed at any time,
+so memory stays bounded while the parse pool is kept busy. Nothing is
+staged on local disk, and one storage client is shared by every thread.
+"""
+import io
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import PurePosixPath
+
+import pandas as pd
+
+from gInvoiceParser.ledger import ProcessedLedger
+from gInvoiceParser.normalize import normalize_frames
+from gInvoiceParser.parser import extractor_map, process_pdf_job
+from gInvoiceParser.storage import Storage
+from gInvoiceParser.timing import BatchTimings
+
+logger = logging.getLogger(__name__)
+
+
+def _ready():
+    # Run once in each parse worker so the pool forks before any I/O thread exists
+    return os.getpid()
+
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+class BatchPipeline:
+    def __init__(self, ingest: Storage, output: Storage = None, ingest_prefix: str = "batch_ingest/",
+                 processed_prefix: str = "processed_files/", output_prefix: str = "aggregates/",
+                 processed_list: str = "list_of_processed_files.txt", workers: int = None,
+                 io_threads: int = 8, max_in_flight: int = None, extractor_map: dict = extractor_map,
+                 ledger: ProcessedLedger = None, memory_limit_mb: float = None):
+        self.ingest = ingest
+        self.output = output or ingest
+        self.ingest_prefix = ingest_prefix
+        self.processed_prefix = processed_prefix
+        self.output_prefix = output_prefix
+        # The old rewritten-list file is imported into a new ledger once, then left alone
+        self.ledger = ledger or ProcessedLedger(ingest, legacy_list=processed_list)
+        self.workers = workers or os.cpu_count() or 1
+        self.io_threads = max(1, io_threads)
+        self.max_in_flight = max_in_flight or max(self.workers * 2, self.io_threads)
+        self.extractor_map = extractor_map
+        self.memory_limit_mb = memory_limit_mb
+
+        self.results_by_product = defaultdict(list)
+        self.products = {}
+        self.failures = {}
+        self.skipped = []
+        self.timings = BatchTimings()
+
+    def pending_files(self) -> list:
+        """PDFs waiting under the ingest prefix, minus those already processed."""
+        names = []
+        for name in self.ingest.list(self.ingest_prefix):
+            file_name = PurePosixPath(name).name
+            if not file_name.lower().endswith(".pdf"):
+                logger.warning("Skipping non-PDF object: %s", name)
+            elif file_name in self.ledger:
+                self.skipped.append(name)
+            else:
+                names.append(name)
+        return names
+
+    def run(self) -> dict:
+        """Process everything waiting under the ingest prefix and return a summary."""
+        start = time.perf_counter()
+        self.ledger.load()
+        names = self.pending_files()
+        logger.info("%d PDF(s) to process, %d already processed", len(names), len(self.skipped))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as parse_pool:
+            for _ in range(self.workers):
+                parse_pool.submit(_ready).result()
+            with ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix="storage") as io_pool:
+                # Files processed on an earlier run are only cleaned out of the ingest prefix
+                cleanup = [io_pool.submit(self.ingest.delete, name) for name in self.skipped]
+                try:
+                    self._run_stages(names, parse_pool, io_pool)
+                finally:
+                    self.ledger.flush()
+                self.ledger.compact()
+                outputs = self._upload_outputs(io_pool)
+                for future in cleanup:
+                    future.result()
+
+        elapsed = time.perf_counter() - start
+        documents = len(self.timings.documents)
+        return {
+            "documents": documents,
+            "skipped": len(self.skipped),
+            "rows": {product: sum(len(df) for df in dfs) for product, dfs in self.results_by_product.items()},
+            "outputs": outputs,
+            "failed": [{"file": name, "errors": errors} for name, errors in self.failures.items()],
+            "elapsed_s": round(elapsed, 3),
+            "docs_per_s": round(documents / elapsed, 3) if elapsed else None,
+        }
+
+    def _run_stages(self, names: list, parse_pool, io_pool):
+        queued = iter(names)
+        pending = {}
+        in_flight = 0
+
+        def fill():
+            nonlocal in_flight
+            while in_flight < self.max_in_flight:
+                name = next(queued, None)
+                if name is None:
+                    return
+                pending[io_pool.submit(self.ingest.read_bytes, name)] = ("download", name)
+                in_flight += 1
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, name = pending.pop(future)
+                file_name = PurePosixPath(name).name
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("%s failed for %s: %s", stage.capitalize(), name, e)
+                    self.failures.setdefault(name, []).append(f"{stage} failed: {e}")
+                    if stage != "move":
+                        in_flight -= 1
+                    continue
+
+                if stage == "download":
+                    job = parse_pool.submit(process_pdf_job, file_name, self.extractor_map, None, result,
+                                            self.memory_limit_mb)
+                    pending[job] = ("parse", name)
+                elif stage == "parse":
+                    in_flight -= 1
+                    if self._collect(name, result):
+                        move = io_pool.submit(self.ingest.move, name, self.processed_prefix + file_name)
+                        pending[move] = ("move", name)
+                else:
+                    self.ledger.add(file_name)
+            fill()
+
+    def _collect(self, name: str, result) -> bool:
+        """Keep a parsed invoice's rows; True if it produced any (and should be moved)."""
+        product_type, frames, seconds, errors, _ = result
+        self.timings.record(name, product_type, seconds)
+        if errors:
+            self.failures[name] = list(errors)
+        if not frames:
+            logger.warning("No data extracted for %s (%s); leaving it in place", name, product_type)
+            return False
+        self.products[PurePosixPath(name).name] = product_type
+        self.results_by_product[product_type].extend(frames)
+        logger.info("Parsed %s (%s): %d rows", name, product_type, sum(len(df) for df in frames))
+        return True
+
+    def _upload_outputs(self, io_pool) -> list:
+        """Write one CSV per product plus the file -> product summary, concurrently."""
+        uploads = {}
+        for product_type, dfs in self.results_by_product.items():
+            name = f"{self.output_prefix}{product_type.lower()}.csv"
+            data = _csv_bytes(normalize_frames(product_type, dfs))
+            uploads[name] = io_pool.submit(self.output.write_bytes, name, data, "text/csv")
+        if self.products:
+            summary = pd.DataFrame({"Filename": list(self.products), "ProductType": list(self.products.values())})
+            name = f"{self.output_prefix}aggregate_summary.csv"
+            uploads[name] = io_pool.submit(self.output.write_bytes, name, _csv_bytes(summary), "text/csv")
+
+        outputs = []
+        for name, future in uploads.items():
+            try:
+                future.result()
+                outputs.append(name)
+                logger.info("Uploaded %s", name)
+            except Exception as e:
+                logger.error("Failed to upload %s: %s", name, e)
+                self.failures.setdefault(name, []).append(f"upload failed: {e}")
+        return outputs
@@ -0,0 +1,180 @@
+"""
+Persistent cache of parsed invoice DataFrames.
+
+Where the manifest remembers which files in one folder were parsed, this
+cache is keyed by content alone: the PDF's sha256 plus the fingerprint of
+the extractor that parsed it (manifest.extractor_version). The same invoice
+under another name or folder is a hit, and changing one vendor's extractor
+only invalidates that vendor's entries.
+
+Layout of the cache directory (one Parquet file per invoice):
+
+    <PRODUCT>/<extractor version>/<sha256>.parquet
+
+The directories for the current extractor versions are listed once per
+run, so looking up a PDF only needs its hash, and hits are read back in
+bulk on a thread pool. Requires pyarrow.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from gInvoiceParser.manifest import extractor_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_DIR = Path.home() / ".gInvoiceParser" / "result_cache"
+
+# Parquet key-value metadata holding how to split an entry back into frames
+_META_KEY = b"gInvoiceParser"
+_FRAME_COLUMN = "__frame__"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("ResultCache requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+class ResultCache:
+    SUFFIX = ".parquet"
+
+    def __init__(self, cache_dir=None, io_threads: int = 8):
+        self.pa = _pyarrow()
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_RESULT_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.io_threads = max(1, io_threads)
+        self._versions = {}
+        self._index = None
+
+    def version_for(self, product_type: str, extractor) -> str:
+        version = self._versions.get(product_type)
+        if version is None:
+            version = self._versions[product_type] = extractor_version(product_type, extractor)
+        return version
+
+    def _path(self, product_type: str, version: str, digest: str) -> Path:
+        return self.cache_dir / product_type / version / f"{digest}{self.SUFFIX}"
+
+    def load_index(self, extractor_map: dict) -> dict:
+        """List the entries for the current extractor versions as {sha256: product_type}."""
+        index = {}
+        for product_type, extractor in extractor_map.items():
+            directory = self.cache_dir / product_type / self.version_for(product_type, extractor)
+            try:
+                names = os.listdir(directory)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                if name.endswith(self.SUFFIX):
+                    index[name[:-len(self.SUFFIX)]] = product_type
+        self._index = index
+        return index
+
+    def lookup(self, digest: str, extractor_map: dict):
+        """The product type cached for this PDF hash, or None on a miss."""
+        if self._index is None:
+            self.load_index(extractor_map)
+        return self._index.get(digest)
+
+    def get(self, digest: str, product_type: str, extractor, pdf_file=None):
+        """The cached frames for one PDF, or None if missing or unreadable."""
+        path = self._path(product_type, self.version_for(product_type, extractor), digest)
+        try:
+            table = self.pa.parquet.read_table(path, use_threads=False)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Corrupt or partially written entry; drop it and re-parse
+            logger.warning("Dropping unreadable cached result %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            if self._index is not None:
+                self._index.pop(digest, None)
+            return None
+        return _split_frames(table, pdf_file)
+
+    def get_many(self, requests: list) -> list:
+        """
+        Bulk get: `requests` is a list of (digest, product_type, extractor,
+        pdf_file); returns the frames (or None) for each, in order.
+        """
+        if len(requests) < 2:
+            return [self.get(*request) for request in requests]
+        for product_type, extractor in {(r[1], r[2]) for r in requests}:
+            self.version_for(product_type, extractor)
+        with ThreadPoolExecutor(max_workers=min(self.io_threads, len(requests))) as pool:
+            return list(pool.map(lambda request: self.get(*request), requests))
+
+    def put(self, digest: str, product_type: str, frames: list, extractor, pdf_file=None):
+        """Store the frames one PDF produced (possibly none)."""
+        path = self._path(product_type, self.version_for(product_type, extractor), digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = _join_frames(self.pa, frames, pdf_file)
+        # Write-then-rename so concurrent runs never see a torn entry
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            self.pa.parquet.write_table(table, tmp_name)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if self._index is not None:
+            self._index[digest] = product_type
+
+    def prune(self, extractor_map: dict) -> int:
+        """Delete entries written by older extractor versions; returns how many version dirs went."""
+        removed = 0
+        for product_type, extractor in extractor_map.items():
+            current = self.version_for(product_type, extractor)
+            product_dir = self.cache_dir / product_type
+            if not product_dir.is_dir():
+                continue
+            for version_dir in product_dir.iterdir():
+                if version_dir.is_dir() and version_dir.name != current:
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                    removed += 1
+        return removed
+
+
+def _join_frames(pa, frames: list, pdf_file) -> "pa.Table":
+    # All frames go in one file; a frame-number column and the metadata split them again
+    meta = {"source": str(pdf_file) if pdf_file is not None else None,
+            "frames": [list(map(str, df.columns)) for df in frames]}
+    if frames:
+        joined = pd.concat([df.assign(**{_FRAME_COLUMN: i}) for i, df in enumerate(frames)], ignore_index=True)
+    else:
+        joined = pd.DataFrame({_FRAME_COLUMN: pd.array([], dtype="int64")})
+    table = pa.Table.from_pandas(joined, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = json.dumps(meta).encode("utf-8")
+    return table.replace_schema_metadata(metadata)
+
+
+def _split_frames(table, pdf_file) -> list:
+    meta = json.loads(table.schema.metadata[_META_KEY])
+    joined = table.to_pandas()
+    frame_numbers = joined.pop(_FRAME_COLUMN)
+    frames = []
+    for i, columns in enumerate(meta["frames"]):
+        df = joined.loc[frame_numbers == i, columns].reset_index(drop=True)
+        frames.append(_rename_source(df, meta["source"], pdf_file))
+    return frames
+
+
+def _rename_source(df: pd.DataFrame, source, pdf_file) -> pd.DataFrame:
+    # The cached rows name the file they were parsed from (by path or by name,
+    # depending on the extractor); point them at this copy instead
+    if "filename" not in df.columns or source is None or pdf_file is None or str(pdf_file) == source:
+        return df
+    df["filename"] = df["filename"].replace({source: str(pdf_file), Path(source).name: Path(pdf_file).name})
+    return df
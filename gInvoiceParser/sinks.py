@@ -0,0 +1,257 @@
+"""
+Streaming result sinks.
+
+A sink receives each invoice's rows as soon as its extractor returns and
+appends them to per-product output, so SuperHeroFlex doesn't have to hold
+the whole batch in memory and a late failure doesn't lose earlier work.
+"""
+import csv
+import logging
+import re
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def output_stem(product_type: str) -> str:
+    return f"{product_type.lower().replace(' ', '_')}_invoices"
+
+
+class ResultSink:
+    """Base class: write() is called once per invoice DataFrame, close() once at the end."""
+
+    # True when rows are added to an earlier run's output instead of replacing it
+    append = False
+
+    def write(self, product_type: str, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @property
+    def outputs(self) -> dict:
+        """Where each product's rows have been written."""
+        return {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _FileSink(ResultSink):
+    extension = ""
+
+    def __init__(self, output_dir, append: bool = False):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.append = append
+        self.paths = {}
+
+    def path_for(self, product_type: str) -> Path:
+        return self.output_dir / f"{output_stem(product_type)}{self.extension}"
+
+    def _open_path(self, product_type: str) -> Path:
+        # First write of the run truncates unless appending to earlier output
+        path = self.paths.get(product_type)
+        if path is None:
+            path = self.path_for(product_type)
+            if not self.append:
+                path.unlink(missing_ok=True)
+            self.paths[product_type] = path
+        return path
+
+    @property
+    def outputs(self) -> dict:
+        return dict(self.paths)
+
+
+class CSVSink(_FileSink):
+    extension = ".csv"
+
+    def __init__(self, output_dir, append: bool = False):
+        super().__init__(output_dir, append)
+        self._columns = {}
+
+    def _known_columns(self, product_type: str, path: Path) -> list:
+        columns = self._columns.get(product_type)
+        if columns is None:
+            columns = []
+            if path.exists() and path.stat().st_size:
+                with path.open(newline="", encoding="utf-8") as fh:
+                    columns = next(csv.reader(fh), [])
+            self._columns[product_type] = columns
+        return columns
+
+    def write(self, product_type: str, df: pd.DataFrame):
+        path = self._open_path(product_type)
+        columns = self._known_columns(product_type, path)
+        new_columns = [c for c in df.columns if c not in columns]
+        if new_columns:
+            columns = columns + new_columns
+            if path.exists() and path.stat().st_size:
+                # A header can't be extended in place; rewrite once with the wider column set
+                existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+                existing.reindex(columns=columns).to_csv(path, index=False)
+            self._columns[product_type] = columns
+
+        write_header = not path.exists() or path.stat().st_size == 0
+        df.reindex(columns=columns).to_csv(path, mode="a", header=write_header, index=False)
+
+
+class JSONLSink(_FileSink):
+    extension = ".jsonl"
+
+    def write(self, product_type: str, df: pd.DataFrame):
+        path = self._open_path(product_type)
+        payload = df.to_json(orient="records", lines=True, date_format="iso")
+        if not payload.endswith("\n"):
+            payload += "\n"
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write(payload)
+
+
+class ParquetSink(_FileSink):
+    """
+    Writes each product to a directory of Parquet part files. A part is
+    closed (and therefore readable) every rows_per_part rows, so at most one
+    part's worth of rows is at risk if the run dies.
+    """
+
+    def __init__(self, output_dir, append: bool = False, rows_per_part: int = 50_000):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError("ParquetSink requires pyarrow: pip install pyarrow") from e
+        super().__init__(output_dir, append)
+        self.rows_per_part = rows_per_part
+        self._writers = {}
+        self._schemas = {}
+
+    def path_for(self, product_type: str) -> Path:
+        return self.output_dir / output_stem(product_type)
+
+    def _open_path(self, product_type: str) -> Path:
+        path = self.paths.get(product_type)
+        if path is None:
+            path = self.path_for(product_type)
+            if not self.append and path.exists():
+                for part in path.glob("part-*.parquet"):
+                    part.unlink()
+            path.mkdir(parents=True, exist_ok=True)
+            self.paths[product_type] = path
+        return path
+
+    def _conform(self, product_type: str, df: pd.DataFrame):
+        import pyarrow as pa
+
+        schema = self._schemas.get(product_type)
+        if schema is None:
+            # Mixed-type object columns (e.g. "" next to numbers) are kept as text
+            df = df.astype({c: "string" for c in df.columns if df[c].dtype == object})
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schemas[product_type] = table.schema
+            return table
+
+        dropped = [c for c in df.columns if c not in schema.names]
+        if dropped:
+            logger.warning("Dropping columns %s not in the %s Parquet schema", dropped, product_type)
+        df = df.reindex(columns=schema.names)
+        for field in schema:
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+                df[field.name] = df[field.name].astype("string")
+            elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                df[field.name] = pd.to_numeric(df[field.name], errors="coerce")
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False, safe=False)
+
+    def _writer(self, product_type: str, schema):
+        import pyarrow.parquet as pq
+
+        state = self._writers.get(product_type)
+        if state is None or state["rows"] >= self.rows_per_part:
+            if state is not None:
+                state["writer"].close()
+            directory = self._open_path(product_type)
+            index = len(list(directory.glob("part-*.parquet")))
+            path = directory / f"part-{index:05d}.parquet"
+            state = {"writer": pq.ParquetWriter(path, schema), "rows": 0}
+            self._writers[product_type] = state
+        return state
+
+    def write(self, product_type: str, df: pd.DataFrame):
+        table = self._conform(product_type, df)
+        state = self._writer(product_type, table.schema)
+        state["writer"].write_table(table)
+        state["rows"] += table.num_rows
+
+    def close(self):
+        for state in self._writers.values():
+            state["writer"].close()
+        self._writers.clear()
+
+
+class SQLiteSink(ResultSink):
+    """Appends each product to its own table in a single SQLite database."""
+
+    def __init__(self, database, append: bool = False):
+        self.database = Path(database)
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        self.append = append
+        self._conn = sqlite3.connect(self.database)
+        self._columns = {}
+
+    @staticmethod
+    def table_for(product_type: str) -> str:
+        return re.sub(r"\W+", "_", output_stem(product_type))
+
+    def _ensure_table(self, table: str, df: pd.DataFrame):
+        columns = self._columns.get(table)
+        if columns is None:
+            if not self.append:
+                self._conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            rows = self._conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+            columns = {row[1] for row in rows}
+            self._columns[table] = columns
+        if columns:
+            for column in df.columns:
+                if column not in columns:
+                    quoted = column.replace('"', '""')
+                    self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{quoted}"')
+                    columns.add(column)
+
+    def write(self, product_type: str, df: pd.DataFrame):
+        table = self.table_for(product_type)
+        self._ensure_table(table, df)
+        df.to_sql(table, self._conn, if_exists="append", index=False)
+        self._columns[table].update(df.columns)
+        self._conn.commit()
+
+    @property
+    def outputs(self) -> dict:
+        return {table: self.database for table in self._columns}
+
+    def close(self):
+        self._conn.close()
+
+
+SINK_FORMATS = {
+    "csv": CSVSink,
+    "jsonl": JSONLSink,
+    "parquet": ParquetSink,
+    "sqlite": SQLiteSink,
+}
+
+
+def make_sink(fmt: str, output_dir, append: bool = False) -> ResultSink:
+    """Build a sink by format name, writing under output_dir."""
+    if fmt not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(SINK_FORMATS)}")
+    if fmt == "sqlite":
+        return SQLiteSink(Path(output_dir) / "invoices.sqlite", append=append)
+    return SINK_FORMATS[fmt](output_dir, append=append)
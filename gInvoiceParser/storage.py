@@ -0,0 +1,158 @@
+"""
+Object storage behind one small interface.
+
+The batch pipeline reads invoices from and writes results to a Storage:
+LocalStorage maps object names onto files under a directory (for running
+and testing offline), GCSStorage onto a Cloud Storage bucket. Object names
+always use "/" separators, e.g. "batch_ingest/invoice.pdf".
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class Storage:
+    """A flat namespace of named byte objects."""
+
+    def list(self, prefix: str = "") -> list:
+        """Names of the objects starting with prefix, sorted."""
+        raise NotImplementedError
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def read_bytes(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    def write_bytes(self, name: str, data: bytes, content_type: str = None):
+        raise NotImplementedError
+
+    def delete(self, name: str):
+        """Remove an object; a missing one is not an error."""
+        raise NotImplementedError
+
+    def move(self, source: str, destination: str):
+        self.write_bytes(destination, self.read_bytes(source))
+        self.delete(source)
+
+    def read_text(self, name: str) -> str:
+        return self.read_bytes(name).decode("utf-8")
+
+    def write_text(self, name: str, text: str, content_type: str = "text/plain"):
+        self.write_bytes(name, text.encode("utf-8"), content_type)
+
+
+class LocalStorage(Storage):
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return f"LocalStorage({str(self.root)!r})"
+
+    def path(self, name: str) -> Path:
+        return self.root / name
+
+    def list(self, prefix: str = "") -> list:
+        # Walk only the directory part of the prefix, then filter on the rest
+        base = self.path(prefix.rsplit("/", 1)[0]) if "/" in prefix else self.root
+        if not base.is_dir():
+            return []
+        names = []
+        for root, _, files in os.walk(base):
+            for file_name in files:
+                name = (Path(root) / file_name).relative_to(self.root).as_posix()
+                if name.startswith(prefix) and not file_name.startswith(".tmp"):
+                    names.append(name)
+        return sorted(names)
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).is_file()
+
+    def read_bytes(self, name: str) -> bytes:
+        return self.path(name).read_bytes()
+
+    def write_bytes(self, name: str, data: bytes, content_type: str = None):
+        path = self.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def delete(self, name: str):
+        self.path(name).unlink(missing_ok=True)
+
+    def move(self, source: str, destination: str):
+        path = self.path(destination)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(self.path(source), path)
+
+
+_gcs_client = None
+_gcs_lock = threading.Lock()
+
+
+def gcs_client():
+    """The process-wide Cloud Storage client; its HTTP connection pool is shared by every bucket."""
+    global _gcs_client
+    with _gcs_lock:
+        if _gcs_client is None:
+            try:
+                from google.cloud import storage
+            except ImportError as e:
+                raise ImportError("GCSStorage requires google-cloud-storage: pip install google-cloud-storage") from e
+            _gcs_client = storage.Client()
+        return _gcs_client
+
+
+class GCSStorage(Storage):
+    def __init__(self, bucket_name: str, client=None):
+        self.client = client or gcs_client()
+        self.bucket = self.client.bucket(bucket_name)
+
+    def __repr__(self):
+        return f"GCSStorage({self.bucket.name!r})"
+
+    def list(self, prefix: str = "") -> list:
+        return sorted(blob.name for blob in self.client.list_blobs(self.bucket, prefix=prefix)
+                      if not blob.name.endswith("/"))
+
+    def exists(self, name: str) -> bool:
+        return self.bucket.blob(name).exists()
+
+    def read_bytes(self, name: str) -> bytes:
+        return self.bucket.blob(name).download_as_bytes()
+
+    def write_bytes(self, name: str, data: bytes, content_type: str = None):
+        self.bucket.blob(name).upload_from_string(data, content_type=content_type or "application/octet-stream")
+
+    def delete(self, name: str):
+        from google.api_core.exceptions import NotFound
+
+        try:
+            self.bucket.delete_blob(name)
+        except NotFound:
+            pass
+
+    def move(self, source: str, destination: str):
+        # Server-side copy, no bytes pass through this process
+        self.bucket.copy_blob(self.bucket.blob(source), self.bucket, destination)
+        self.delete(source)
+
+
+def open_storage(location: str) -> Storage:
+    """A Storage for "gs://bucket" (any path after the bucket is ignored) or a local directory path."""
+    location = str(location)
+    if location.startswith("gs://"):
+        return GCSStorage(location[len("gs://"):].split("/", 1)[0])
+    return LocalStorage(location)
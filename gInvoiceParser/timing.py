@@ -0,0 +1,77 @@
+"""
+Per-stage wall-clock timings for the extraction pipeline.
+
+Stages nest (text extraction happens lazily while identifying or
+extracting), so each stage is timed exclusively: entering an inner stage
+pauses the outer one, and the stage totals of a document add up to its
+wall time.
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+STAGES = ("open", "text", "identify", "extract", "export")
+
+
+class StageTimer:
+    """Accumulates exclusive seconds per stage for one document."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str):
+        now = perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.seconds[parent[0]] += now - parent[1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            _, started = self._stack.pop()
+            self.seconds[name] = self.seconds.get(name, 0.0) + now - started
+            if self._stack:
+                self._stack[-1][1] = now
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+
+def timed(timer: StageTimer, name: str):
+    """timer.stage(name), or a no-op when there is no timer."""
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+class BatchTimings:
+    """
+    Stage timings for a SuperHeroFlex run, per document and summed per
+    product. Export time is only known per product, so it appears in
+    by_product and totals but not in documents.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.by_product = defaultdict(Counter)
+
+    def record(self, name: str, product_type: str, seconds: dict):
+        if name is not None:
+            self.documents[name] = {"product_type": product_type, **seconds}
+        self.by_product[product_type].update(seconds)
+
+    @property
+    def totals(self) -> Counter:
+        totals = Counter(dict.fromkeys(STAGES, 0.0))
+        for seconds in self.by_product.values():
+            totals.update(seconds)
+        return totals
+
+    def summary(self) -> dict:
+        """Plain dict of per-product and overall stage seconds."""
+        return {
+            "by_product": {product: dict(seconds) for product, seconds in self.by_product.items()},
+            "totals": dict(self.totals),
+        }
@@ -1,4 +1,4 @@
-import requests, zipfile, io, os, sys, shutil
+import requests, zipfile, io, os, sys, shutil, logging
 from tkinter import messagebox
 
 LOCAL_VERSION = "0.1.0"
@@ -6,6 +6,8 @@ VERSION_URL = "https://bitbucket.org/hs2studio/gmp-accounting-tool/src/main/vers
 ZIP_URL = "https://bitbucket.org/hs2studio/gmp-accounting-tool/src/main/gInvoiceParserAppBundle.zip"
 APP_DIR = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
 
+logger = logging.getLogger(__name__)
+
 def check_for_update():
     try:
         response = requests.get(VERSION_URL, timeout=5)
@@ -17,7 +19,7 @@ def check_for_update():
                     messagebox.showinfo("Update Complete", "Restart the app to use the latest version.")
                     sys.exit()
     except Exception as e:
-        print(f"[Update] Error: {e}")
+        logger.warning("Update check failed: %s", e)
 
 def download_and_extract():
     response = requests.get(ZIP_URL, stream=True)
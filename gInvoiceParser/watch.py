@@ -0,0 +1,325 @@
+"""
+Watch-folder mode.
+
+Watches a drop folder for new or modified PDFs (inotify on Linux, polling
+elsewhere or when asked), waits until each file has stopped changing, and
+feeds it through a bounded queue into a process pool that stays up for the
+life of the watcher. Rows are appended to a streaming sink, and a manifest
+keeps restarts from re-emitting invoices that were already processed.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import select
+import struct
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from gInvoiceParser.manifest import Manifest
+from gInvoiceParser.parser import SuperHeroFlex, iter_pdf_files, process_pdf_job
+from gInvoiceParser.sinks import ResultSink
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+def _is_pdf(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def _looks_complete(path: Path) -> bool:
+    """A fully written PDF ends with an %%EOF marker (possibly followed by whitespace)."""
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            fh.seek(max(0, fh.tell() - 1024))
+            return b"%%EOF" in fh.read()
+    except OSError:
+        return False
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+
+    def add_watch(self, directory: Path):
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = directory
+
+    def read(self, timeout: float):
+        """Yield (path, mask) for events arriving within timeout seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.dirs.get(wd)
+            if mask & IN_Q_OVERFLOW:
+                yield None, mask
+            elif directory is not None and name:
+                yield directory / os.fsdecode(name), mask
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    Detects new or modified PDFs under a directory and reports each once it
+    is stable: unchanged for `settle` seconds and ending in %%EOF (files
+    that never grow a trailer are accepted after ten settle periods).
+    """
+
+    def __init__(self, directory, recursive: bool = True, poll: bool = False,
+                 poll_interval: float = 1.0, settle: float = 1.0):
+        self.directory = Path(directory)
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._pending = {}
+        self._snapshot = {}
+        self._inotify = None
+        if not poll:
+            try:
+                self._inotify = _Inotify()
+                self._watch_tree(self.directory)
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable (%s); polling %s every %.1fs", e, self.directory, poll_interval)
+                self._close_inotify()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _watch_tree(self, directory: Path):
+        self._inotify.add_watch(directory)
+        if self.recursive:
+            for root, dirs, _ in os.walk(directory):
+                for name in dirs:
+                    self._inotify.add_watch(Path(root) / name)
+
+    def _close_inotify(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def existing(self):
+        """Queue the PDFs already in the folder as candidates."""
+        self._scan(note_all=True)
+
+    def prime(self):
+        """Treat the PDFs already in the folder as seen, so only later changes are reported."""
+        self._scan(note=False)
+
+    def _note(self, path: Path):
+        try:
+            stat = path.stat()
+        except OSError:
+            self._pending.pop(path, None)
+            return
+        self._pending[path] = (stat.st_size, stat.st_mtime_ns, time.monotonic())
+
+    def _scan(self, note: bool = True, note_all: bool = False):
+        snapshot = {}
+        for path in iter_pdf_files(self.directory, self.recursive):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+            if note and (note_all or self._snapshot.get(path) != snapshot[path]):
+                self._note(path)
+        self._snapshot = snapshot
+
+    def _collect_events(self, timeout: float):
+        if self._inotify is None:
+            time.sleep(timeout)
+            self._scan()
+            return
+        for path, mask in self._inotify.read(timeout):
+            if path is None:
+                logger.warning("inotify queue overflowed; rescanning %s", self.directory)
+                self.existing()
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self.recursive:
+                    self._watch_tree(path)
+                    for pdf in iter_pdf_files(path, True):
+                        self._note(pdf)
+            elif _is_pdf(path.name):
+                self._note(path)
+
+    def ready(self, timeout: float) -> list:
+        """Wait up to timeout for activity and return the paths that have become stable."""
+        self._collect_events(timeout if self._inotify is not None else self.poll_interval)
+        now = time.monotonic()
+        stable = []
+        for path, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle and (_looks_complete(path) or now - since >= self.settle * 10):
+                del self._pending[path]
+                stable.append(path)
+        return stable
+
+    def close(self):
+        self._close_inotify()
+
+
+def _warm_up():
+    # Runs once in each pool worker so imports happen before the first invoice arrives
+    return os.getpid()
+
+
+class InvoiceWatcher:
+    """
+    Long-running watch mode around SuperHeroFlex.
+
+    A watcher thread puts stable PDFs on a bounded queue (blocking when the
+    pool falls behind); the main loop keeps up to `workers * 2` invoices in
+    flight on a persistent process pool and appends each result to `sink`.
+    An invoice whose content changes after it was processed is parsed and
+    appended again; unchanged ones are never re-emitted, across restarts too.
+    """
+
+    def __init__(self, directory, sink: ResultSink, manifest: Manifest, workers: int = 2,
+                 recursive: bool = True, poll: bool = False, poll_interval: float = 1.0,
+                 settle: float = 1.0, queue_size: int = 100, process_existing: bool = True,
+                 text_cache=None, memory_limit_mb: float = None):
+        self.flex = SuperHeroFlex(pdf_dir=directory, sink=sink, manifest=manifest, recursive=recursive,
+                                  text_cache=text_cache, memory_limit_mb=memory_limit_mb)
+        self.watcher = FolderWatcher(directory, recursive, poll, poll_interval, settle)
+        self.workers = max(1, workers)
+        self.process_existing = process_existing
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.processed = 0
+        # Paths that became stable again while in flight: checked once their job finishes
+        self._changed = set()
+        self._retry = []
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _watch_loop(self):
+        if self.process_existing:
+            self.watcher.existing()
+        else:
+            self.watcher.prime()
+        while not self.stop_event.is_set():
+            for path in self.watcher.ready(timeout=0.25):
+                # Blocks while the queue is full, which is the back-pressure on a burst of drops
+                while not self.stop_event.is_set():
+                    try:
+                        self.queue.put(path, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+    def _is_unchanged(self, path: Path) -> bool:
+        return self.flex.manifest.lookup(path, self.flex.extractor_map) is not None
+
+    def _finish(self, future, in_flight: dict):
+        path, queued_at = in_flight.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.critical("Failed processing %s: %s", path, e)
+            result = (None, [], {}, [f"Failed processing: {e}"], None)
+        self.flex.remember_result(path, result)
+        self.flex.add_result(path, result)
+        self.flex.manifest.save()
+        self.processed += 1
+        if path in self._changed:
+            self._changed.discard(path)
+            self._retry.append(path)
+        product_type, frames = result[0], result[1]
+        logger.info("Processed %s (%s): %d rows in %.1fs", path.name, product_type,
+                    sum(len(df) for df in frames), time.monotonic() - queued_at)
+
+    def run(self):
+        """Process invoices until stop() is called (or KeyboardInterrupt)."""
+        logger.info("Watching %s (%s, %d workers)", self.watcher.directory, self.watcher.mode, self.workers)
+        thread = threading.Thread(target=self._watch_loop, name="invoice-watcher", daemon=True)
+        in_flight = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for _ in range(self.workers):
+                    pool.submit(_warm_up)
+                thread.start()
+                while not self.stop_event.is_set() or in_flight:
+                    if in_flight:
+                        # Only poll while there is room to take more work; when full or
+                        # draining after stop(), block until a job finishes
+                        idle = len(in_flight) < self.workers * 2 and not self.stop_event.is_set()
+                        done, _ = wait(in_flight, timeout=0 if idle else 0.5, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(future, in_flight)
+                    if self.stop_event.is_set() or len(in_flight) >= self.workers * 2:
+                        continue
+                    if self._retry:
+                        path = self._retry.pop(0)
+                    else:
+                        try:
+                            path = self.queue.get(timeout=0.1 if in_flight else 0.5)
+                        except queue.Empty:
+                            continue
+                    if any(path == busy for busy, _ in in_flight.values()):
+                        # Modified while being parsed: look at it again once this job is done
+                        logger.debug("%s changed while in flight; re-checking after it finishes", path.name)
+                        self._changed.add(path)
+                        continue
+                    if self._is_unchanged(path):
+                        logger.debug("Skipping unchanged %s", path.name)
+                        continue
+                    future = pool.submit(process_pdf_job, path, self.flex.extractor_map, self.flex.text_cache,
+                                         memory_limit_mb=self.flex.memory_limit_mb)
+                    in_flight[future] = (path, time.monotonic())
+        except KeyboardInterrupt:
+            self.stop_event.set()
+        finally:
+            self.stop_event.set()
+            if thread.ident is not None:
+                thread.join(timeout=2)
+            self.watcher.close()
+            self.flex.manifest.save()
+            if self.flex.sink is not None:
+                self.flex.sink.close()
+        logger.info("Watcher stopped after %d invoice(s)", self.processed)
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The synthetic invoice generator lives with the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from synthetic import write_invoice  # noqa: E402
+
+
+@pytest.fixture
+def invoice(tmp_path):
+    """Write a synthetic invoice for a product and return its path."""
+    def make(product, name=None, n_pages=2, seed=0, directory=None):
+        directory = Path(directory or tmp_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        return write_invoice(directory / (name or f"{product.lower()}_{seed}.pdf"), product, n_pages, seed)
+    return make
+
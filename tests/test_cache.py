@@ -0,0 +1,54 @@
+import os
+import zlib
+
+from gInvoiceParser.cache import TextCache
+from gInvoiceParser.parser import open_text_dict
+
+
+def _entry(n_pages, text="x"):
+    return {"page_count": n_pages, "pages": {f"page_{i + 1}": {"text": text} for i in range(n_pages)}}
+
+
+def test_key_covers_bytes_settings_and_backend(tmp_path):
+    cache = TextCache(tmp_path)
+    key = cache.key_for(b"%PDF-1", {}, "pdfplumber")
+    assert key == cache.key_for(b"%PDF-1", {}, "pdfplumber")
+    assert key != cache.key_for(b"%PDF-2", {}, "pdfplumber")
+    assert key != cache.key_for(b"%PDF-1", {"layout": True}, "pdfplumber")
+    assert key != cache.key_for(b"%PDF-1", {}, "pypdfium2")
+
+
+def test_put_get_and_corrupt_entries(tmp_path):
+    cache = TextCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, _entry(2))
+    assert cache.get("ab" * 32) == _entry(2)
+
+    cache._path("ab" * 32).write_bytes(zlib.compress(b"{not json"))
+    assert cache.get("ab" * 32) is None
+    assert not cache._path("ab" * 32).exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TextCache(tmp_path, max_bytes=10**9)
+    text = os.urandom(2000).hex()
+    for i, key in enumerate(("aa" * 32, "bb" * 32, "cc" * 32)):
+        cache.put(key, _entry(1, text))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get("aa" * 32)  # now the most recently used
+
+    # Room for two of the three entries, after evicting down to 90%
+    cache.max_bytes = int(cache._path("aa" * 32).stat().st_size * 2.5)
+    cache.evict()
+    assert cache.get("bb" * 32) is None
+    assert cache.get("aa" * 32) and cache.get("cc" * 32)
+
+
+def test_second_open_is_served_from_the_cache(invoice, tmp_path):
+    pdf = invoice("GOOGLE_WORKSPACE", n_pages=3)
+    cache = TextCache(tmp_path / "cache")
+    with open_text_dict(pdf, cache) as pages:
+        first = {key: pages[key]["text"] for key in pages}
+    with open_text_dict(pdf, cache) as pages:
+        assert {key: pages[key]["text"] for key in pages} == first
+        assert pages._pdf is None
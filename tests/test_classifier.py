@@ -0,0 +1,45 @@
+import pytest
+
+from gInvoiceParser.classifier import ProductClassifier, classify
+
+from samples import PRODUCTS, text_dict
+
+
+def _pages(*pages):
+    return {f"page_{i + 1}": {"text": text} for i, text in enumerate(pages)}
+
+
+@pytest.mark.parametrize("product", PRODUCTS)
+def test_synthetic_invoices(product):
+    product_type, confidence = classify(text_dict(product, 3))
+    assert product_type == product and confidence > 0.5
+
+
+@pytest.mark.parametrize("line", ["Media Cost 1,200.00", "Account budget 500.00"])
+def test_supporting_terms_alone_are_unknown(line):
+    doc = _pages("Acme Media invoice\n" + "\n".join([line] * 5), "\n".join([line] * 5))
+    assert classify(doc) == ("UNKNOWN", 0.0)
+
+
+def test_supporting_terms_count_once_the_vendor_is_named():
+    product_type, confidence = classify(_pages("Display & Video 360\nMedia Cost\nPlatform Fee"))
+    assert product_type == "DV360" and confidence == 1.0
+
+
+def test_stray_mention_does_not_decide():
+    doc = _pages("Google Ads\nAccount budget\nAccount budget\nSee also Campaign Manager 360")
+    product_type, confidence = classify(doc)
+    assert product_type == "GOOGLE_ADS" and confidence == pytest.approx(5 / 8)
+
+
+def test_later_pages_are_read_until_decided():
+    doc = _pages("Invoice", "Statement", "Search Ads 360", "Google Ads")
+    assert classify(doc, page_limit=3)[0] == "SA360"
+    assert classify(doc, page_limit=2) == ("UNKNOWN", 0.0)
+
+
+def test_min_score_and_max_hits():
+    classifier = ProductClassifier(min_score=4.0, max_hits=1)
+    classifier.register("ACME", {"Acme Ads": 4.0, "Acme fee": 1.0})
+    assert classifier.classify(_pages("Acme fee\nAcme fee\nAcme fee\nAcme fee")) == ("UNKNOWN", 0.0)
+    assert classifier.classify(_pages("Acme Ads\nAcme fee\nAcme fee")) == ("ACME", 1.0)
@@ -0,0 +1,44 @@
+import shutil
+
+from gInvoiceParser.dedup import find_duplicates, page_one_key
+
+from samples import vendor_pages
+from synthetic import pdf_bytes
+
+
+def test_identical_bytes(invoice, tmp_path):
+    original = invoice("DV360", "original.pdf")
+    copy = shutil.copy(original, tmp_path / "copy.pdf")
+
+    unique, duplicates = find_duplicates([original, copy])
+
+    assert unique == [original]
+    assert duplicates == [{"file": str(copy), "duplicate_of": str(original), "reason": "identical bytes"}]
+
+
+def test_same_invoice_number_on_page_one(invoice, tmp_path):
+    first = invoice("GOOGLE_WORKSPACE", "first.pdf")
+    # The same invoice re-sent with an extra page: different bytes, same page 1
+    resent = tmp_path / "resent.pdf"
+    resent.write_bytes(pdf_bytes(vendor_pages("GOOGLE_WORKSPACE", 2) + [["Remittance details"]]))
+    other = invoice("GOOGLE_WORKSPACE", "other.pdf", seed=1)
+
+    product_type, invoice_number, billing_id = page_one_key(first)
+    assert product_type == "GOOGLE_WORKSPACE" and invoice_number and billing_id
+
+    unique, duplicates = find_duplicates([first, resent, other])
+
+    assert unique == [first, other]
+    assert [(d["file"], d["duplicate_of"]) for d in duplicates] == [(str(resent), str(first))]
+    assert duplicates[0]["reason"].startswith(f"same GOOGLE_WORKSPACE invoice number {invoice_number}")
+
+
+def test_file_listed_twice_is_not_its_own_duplicate(invoice):
+    pdf = invoice("LINKEDIN")
+    assert find_duplicates([pdf, pdf]) == ([pdf], [])
+
+
+def test_unreadable_files_are_kept(tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    assert find_duplicates([broken]) == ([broken], [])
@@ -0,0 +1,52 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from gInvoiceParser.export import sheet_title, write_workbook, write_workbooks
+from gInvoiceParser.parser import SuperHeroFlex
+
+
+def _rows(path, sheet=None):
+    workbook = load_workbook(path, read_only=True)
+    rows = [list(row) for row in workbook[sheet or workbook.sheetnames[0]].iter_rows(values_only=True)]
+    # Read-only mode drops trailing empty cells
+    return [row + [None] * (len(rows[0]) - len(row)) for row in rows]
+
+
+def test_frames_are_written_in_chunks_under_one_header(tmp_path):
+    frames = [pd.DataFrame({"a": ["1", "2", "3"], "b": [1.5, None, 3.0]}),
+              pd.DataFrame({"b": [4.0], "c": pd.array([None], dtype="string")})]
+    rows = write_workbook(tmp_path / "out.xlsx", {"Sheet1": frames}, chunk_rows=2)
+
+    assert rows == 4
+    assert _rows(tmp_path / "out.xlsx") == [["a", "b", "c"], ["1", 1.5, None], ["2", None, None],
+                                            ["3", 3, None], [None, 4, None]]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_workbooks_in_parallel(tmp_path):
+    jobs = {tmp_path / f"{i}.xlsx": {"Sheet1": [pd.DataFrame({"n": range(i + 1)})]} for i in range(3)}
+    written = write_workbooks(jobs, workers=2)
+    assert {path: rows for path, (rows, _) in written.items()} == {path: i + 1 for i, path in enumerate(jobs)}
+    assert _rows(tmp_path / "2.xlsx") == [["n"], [0], [1], [2]]
+
+
+def test_sheet_titles():
+    assert sheet_title("a/b:c") == "a_b_c"
+    assert len(sheet_title("x" * 40)) == 31
+
+
+def test_export_by_product(invoice, tmp_path):
+    files = [invoice("DV360"), invoice("GOOGLE_WORKSPACE")]
+    flex = SuperHeroFlex(file_paths=files)
+    flex.extract_all()
+
+    outputs = flex.export_by_product(tmp_path / "out", workers=2)
+    assert sorted(outputs) == ["DV360", "GOOGLE_WORKSPACE"]
+    for product_type, path in outputs.items():
+        assert len(_rows(path)) == flex.row_counts[product_type] + 1
+
+    single = flex.export_by_product(tmp_path / "single", single_workbook=True)
+    path = single["DV360"]
+    assert set(single.values()) == {path}
+    assert load_workbook(path, read_only=True).sheetnames == ["DV360", "GOOGLE_WORKSPACE"]
+    assert len(_rows(path, "GOOGLE_WORKSPACE")) == flex.row_counts["GOOGLE_WORKSPACE"] + 1
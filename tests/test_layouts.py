@@ -0,0 +1,53 @@
+import pytest
+
+from gInvoiceParser import layouts
+from gInvoiceParser.cli import main
+from gInvoiceParser.document import LazyTextDict
+from gInvoiceParser.layouts import NO_FOOTER, layout_for, register_layout
+from gInvoiceParser.parity import compare_backends
+from gInvoiceParser.parser import extractor_map
+
+from synthetic import pdf_bytes
+
+# Vendors the NO_FOOTER candidate is meant for (see layouts.py)
+CANDIDATES = ("CM360", "DV360", "GOOGLE_WORKSPACE", "LINKEDIN")
+
+
+@pytest.fixture(autouse=True)
+def no_profiles(monkeypatch):
+    monkeypatch.setattr(layouts, "LAYOUT_PROFILES", {})
+
+
+def test_cropping_is_opt_in():
+    assert all(layout_for(product_type) is None for product_type in extractor_map)
+    register_layout("DV360", {"detail": NO_FOOTER})
+    assert layout_for("DV360") == {"detail": NO_FOOTER}
+    register_layout("DV360", None)
+    assert layout_for("DV360") is None
+
+
+def test_detail_region_drops_the_footer_band(tmp_path):
+    # 75 lines reach the bottom 6% of the page
+    pdf = tmp_path / "long.pdf"
+    pdf.write_bytes(pdf_bytes([["Summary"], [f"line {i}" for i in range(75)]]))
+    with LazyTextDict(pdf) as full, LazyTextDict(pdf, layout={"detail": NO_FOOTER}) as cropped:
+        assert "line 74" in full["page_2"]["text"]
+        assert "line 60" in cropped["page_2"]["text"] and "line 74" not in cropped["page_2"]["text"]
+        assert cropped["page_1"]["text"] == full["page_1"]["text"]
+
+
+def test_candidate_profile_keeps_rows_on_the_synthetic_corpus(invoice, tmp_path):
+    files = [invoice(product, n_pages=6, seed=seed) for product in CANDIDATES for seed in range(2)]
+    for product_type in CANDIDATES:
+        register_layout(product_type, {"detail": NO_FOOTER})
+
+    report = compare_backends(files, ["pdfplumber:full", "pdfplumber"])
+
+    assert sorted(report) == sorted(CANDIDATES)
+    assert all(entry["matching"] == entry["files"] == 2 and not entry["mismatches"] for entry in report.values())
+
+
+def test_parity_command_tries_a_profile(invoice, capsys):
+    pdf = invoice("DV360", n_pages=4)
+    assert main(["parity", str(pdf), "--backends", "pdfplumber:full", "pdfplumber", "--layout", "DV360"]) == 0
+    assert layout_for("DV360") == {"detail": NO_FOOTER}
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from gInvoiceParser.ledger import ProcessedLedger
+from gInvoiceParser.storage import LocalStorage
+
+
+def _writer(root, writer, count):
+    # Each process has its own ledger on the same storage, flushing and compacting as it goes
+    ledger = ProcessedLedger(LocalStorage(root), flush_every=3, compact_after=4)
+    for i in range(count):
+        ledger.add(f"w{writer}_{i}.pdf")
+        if i % 5 == 4:
+            ledger.compact()
+    ledger.compact()
+    return writer
+
+
+def test_add_flush_and_reload(tmp_path):
+    storage = LocalStorage(tmp_path)
+    ledger = ProcessedLedger(storage, flush_every=2)
+    for name in ("a.pdf", "b.pdf", "a.pdf", "c.pdf"):
+        ledger.add(name)
+    assert len(storage.list("processed_ledger/")) == 1  # only a full batch has been flushed
+    ledger.flush()
+
+    reloaded = ProcessedLedger(storage).load()
+    assert len(reloaded) == 3
+    assert "c.pdf" in reloaded and "d.pdf" not in reloaded
+
+
+def test_compact_folds_segments_into_one_base(tmp_path):
+    storage = LocalStorage(tmp_path)
+    ledger = ProcessedLedger(storage, flush_every=1, compact_after=50)
+    for i in range(5):
+        ledger.add(f"{i}.pdf")
+    assert not ledger.compact()
+    assert ledger.compact(force=True)
+
+    objects = storage.list("processed_ledger/")
+    assert len(objects) == 1 and objects[0].startswith("processed_ledger/base-")
+    assert len(ProcessedLedger(storage).load()) == 5
+
+
+def test_legacy_list_is_imported_once(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.write_text("list_of_processed_files.txt", "old1.pdf\nold2.pdf\n")
+    ledger = ProcessedLedger(storage, legacy_list="list_of_processed_files.txt").load()
+    assert "old1.pdf" in ledger and len(ledger) == 2
+
+    storage.write_text("list_of_processed_files.txt", "old3.pdf")
+    assert "old3.pdf" not in ProcessedLedger(storage, legacy_list="list_of_processed_files.txt").load()
+
+
+def test_concurrent_writers_keep_every_name(tmp_path):
+    writers, count = 6, 40
+    with ProcessPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(_writer, [tmp_path] * writers, range(writers), [count] * writers))
+
+    ledger = ProcessedLedger(LocalStorage(tmp_path)).load()
+    expected = {f"w{writer}_{i}.pdf" for writer in range(writers) for i in range(count)}
+    assert ledger._names == expected
+
+    ledger.compact(force=True)
+    assert ProcessedLedger(LocalStorage(tmp_path)).load()._names == expected
@@ -0,0 +1,71 @@
+import json
+
+import pandas as pd
+
+from gInvoiceParser.cli import main
+from gInvoiceParser.manifest import Manifest
+from gInvoiceParser.parser import SuperHeroFlex
+
+
+def _extract(capsys, *argv):
+    assert main(["extract", *map(str, argv), "--log-level", "ERROR"]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_unchanged_files_are_skipped_and_their_rows_reused(invoice, tmp_path):
+    folder = tmp_path / "in"
+    pdfs = [invoice("DV360", seed=seed, directory=folder) for seed in range(3)]
+    manifest = Manifest(tmp_path / "manifest")
+
+    first = SuperHeroFlex(pdf_dir=folder, manifest=manifest)
+    first.extract_all()
+    rows = first.row_counts["DV360"]
+    assert first.skipped == [] and rows > 0
+
+    # Replace one invoice with another one's content: only that file is parsed again
+    pdfs[2].write_bytes(pdfs[0].read_bytes())
+    again = SuperHeroFlex(pdf_dir=folder, manifest=Manifest(tmp_path / "manifest"))
+    again.extract_all()
+
+    assert again.skipped == [str(p) for p in pdfs[:2]]
+    assert list(again.timings.documents) == [str(p) for p in pdfs]
+    # Reused and re-parsed rows come out together, in input order
+    rows_by_file = pd.concat(again.results_by_product["DV360"])["filename"].value_counts()
+    assert list(rows_by_file.sort_index().index) == [p.name for p in pdfs]
+    assert rows_by_file["dv360_2.pdf"] == rows_by_file["dv360_0.pdf"]
+    assert again.row_counts["DV360"] == rows_by_file.sum()
+
+
+def _other_extractor(doc, invoice_num, filename, invoice_month):
+    return None
+
+
+def test_stored_rows_depend_on_the_extractor_version(invoice, tmp_path):
+    pdf = invoice("DV360")
+    SuperHeroFlex(file_paths=[pdf], manifest=Manifest(tmp_path / "manifest")).extract_all()
+
+    assert Manifest(tmp_path / "manifest").lookup(pdf, SuperHeroFlex(file_paths=[pdf]).extractor_map)
+    # Another DV360 extractor (any source change) invalidates the stored rows
+    assert Manifest(tmp_path / "manifest").lookup(pdf, {"DV360": _other_extractor}) is None
+
+
+def test_append_with_manifest_does_not_duplicate_rows(invoice, tmp_path, capsys):
+    folder = tmp_path / "in" / "DV360"
+    for seed in range(2):
+        invoice("DV360", seed=seed, directory=folder)
+    out = tmp_path / "out"
+    argv = (folder, "-o", out, "--format", "csv", "--append", "--manifest")
+
+    first = _extract(capsys, *argv)
+    lines = len((out / "dv360_invoices.csv").read_text().splitlines())
+    assert lines == first["rows"]["DV360"] + 1
+
+    second = _extract(capsys, *argv)
+    assert second["skipped"] == 2 and second["rows"] == {}
+    assert len((out / "dv360_invoices.csv").read_text().splitlines()) == lines
+
+    # A new invoice is the only thing appended
+    invoice("DV360", seed=7, directory=folder)
+    third = _extract(capsys, *argv)
+    assert third["skipped"] == 2
+    assert len((out / "dv360_invoices.csv").read_text().splitlines()) == lines + third["rows"]["DV360"]
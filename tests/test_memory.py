@@ -0,0 +1,28 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from gInvoiceParser import parser
+from gInvoiceParser.parser import SuperHeroFlex, extractor_map, process_pdf_job
+
+
+def test_memory_limit_reaches_spawned_workers(invoice):
+    # Spawned workers re-import the parser, so the limit has to travel with the job.
+    # A fresh worker, so the document's growth isn't absorbed by memory freed earlier.
+    pdf = invoice("DV360", n_pages=200)
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        product_type, frames, _, errors, _ = pool.submit(process_pdf_job, pdf, extractor_map,
+                                                         memory_limit_mb=0.01).result()
+
+    assert frames == [] and "exceeded its memory ceiling" in errors[0]
+
+
+def test_superheroflex_passes_the_limit_with_every_job(invoice, monkeypatch):
+    limits = []
+
+    def job(pdf_file, extractor_map, text_cache=None, data=None, memory_limit_mb=None):
+        limits.append(memory_limit_mb)
+        return None, [], {}, [], None
+
+    monkeypatch.setattr(parser, "process_pdf_job", job)
+    SuperHeroFlex(file_paths=[invoice("DV360"), invoice("DV360", seed=1)], memory_limit_mb=64).extract_all()
+    assert limits == [64, 64]
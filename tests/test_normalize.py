@@ -0,0 +1,49 @@
+import pandas as pd
+
+from gInvoiceParser.normalize import normalize_frame, to_datetime, to_number, to_period
+
+
+def test_to_number():
+    values = pd.Series(["$1,234.56", "(12.00)", " 7 ", "", None, "n/a"], dtype="string")
+    result = to_number(values)
+    assert str(result.dtype) == "Float64"
+    assert result.tolist()[:3] == [1234.56, -12.0, 7.0]
+    assert result[3:].isna().all()
+
+
+def test_to_number_int():
+    result = to_number(pd.Series(["1,000", "2.5", "3"], dtype="string"), "Int64")
+    assert str(result.dtype) == "Int64"
+    assert result[0] == 1000 and pd.isna(result[1]) and result[2] == 3
+
+
+def test_to_datetime_formats():
+    values = pd.Series(["Feb 28, 2025", "February 3, 2025", "05-Mar-2025", "04/01/2025", "2025-05-02", "soon"])
+    result = to_datetime(values)
+    assert list(result[:5]) == list(pd.to_datetime(["2025-02-28", "2025-02-03", "2025-03-05",
+                                                    "2025-04-01", "2025-05-02"]))
+    assert pd.isna(result[5])
+
+
+def test_to_period():
+    start, end = to_period(pd.Series(["Jan 1, 2025 - Jan 31, 2025", "February 2025", ""]))
+    assert list(start[:2]) == [pd.Timestamp("2025-01-01"), pd.Timestamp("2025-02-01")]
+    assert list(end[:2]) == [pd.Timestamp("2025-01-31"), pd.Timestamp("2025-02-28")]
+    assert pd.isna(start[2]) and pd.isna(end[2])
+
+
+def test_normalize_frame_is_idempotent():
+    df = pd.DataFrame({
+        "Month": ["Jan 1, 2025 - Jan 31, 2025"],
+        "Invoice#": ["1234567890"],
+        "BillingID": [""],
+        "Amount($)": ["$1,001.00"],
+        "Quantity": ["11"],
+    }, dtype="string")
+    once = normalize_frame(df, "GOOGLE_WORKSPACE")
+
+    assert str(once["Amount($)"].dtype) == "Float64" and once["Amount($)"][0] == 1001.0
+    assert once["Quantity"][0] == 11
+    assert pd.isna(once["BillingID"][0])
+    assert once["PeriodEnd"][0] == pd.Timestamp("2025-01-31")
+    pd.testing.assert_frame_equal(normalize_frame(once, "GOOGLE_WORKSPACE"), once)
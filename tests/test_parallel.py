@@ -0,0 +1,60 @@
+from concurrent.futures import Future
+
+import pandas as pd
+
+from gInvoiceParser import parser
+from gInvoiceParser.parser import SuperHeroFlex
+
+
+class _InlineExecutor:
+    """Runs each job as it is submitted, recording the submission order."""
+
+    submitted = []
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def submit(self, fn, pdf_file, *args, **kwargs):
+        self.submitted.append(pdf_file.name)
+        future = Future()
+        future.set_result(fn(pdf_file, *args, **kwargs))
+        return future
+
+
+def _corpus(invoice, tmp_path):
+    # Input order deliberately mixes small and large documents
+    return [invoice("GOOGLE_WORKSPACE", f"{i}_{pages}p.pdf", n_pages=pages, seed=i, directory=tmp_path / "in")
+            for i, pages in enumerate([2, 3, 12, 2, 6, 2, 9, 2])]
+
+
+def test_parallel_matches_serial_in_input_order(invoice, tmp_path):
+    pdfs = _corpus(invoice, tmp_path)
+    serial = SuperHeroFlex(file_paths=pdfs)
+    serial.extract_all()
+    parallel = SuperHeroFlex(file_paths=pdfs)
+    parallel.extract_all(workers=2)
+
+    assert list(parallel.timings.documents) == [str(p) for p in pdfs]
+    pd.testing.assert_frame_equal(pd.concat(parallel.results_by_product["GOOGLE_WORKSPACE"]),
+                                  pd.concat(serial.results_by_product["GOOGLE_WORKSPACE"]))
+
+
+def test_largest_document_in_the_window_is_submitted_first(invoice, tmp_path, monkeypatch):
+    pdfs = _corpus(invoice, tmp_path)
+    monkeypatch.setattr(parser, "ProcessPoolExecutor", _InlineExecutor)
+    monkeypatch.setattr(_InlineExecutor, "submitted", [])
+
+    flex = SuperHeroFlex(file_paths=pdfs)
+    flex.extract_all(workers=2)
+
+    # Window of 4: the 12-page file jumps the queue, but the 9-page one (index 6) waits its turn
+    assert _InlineExecutor.submitted[:2] == ["2_12p.pdf", "1_3p.pdf"]
+    assert _InlineExecutor.submitted.index("6_9p.pdf") > _InlineExecutor.submitted.index("3_2p.pdf")
+    assert sorted(_InlineExecutor.submitted) == sorted(p.name for p in pdfs)
+    assert list(flex.timings.documents) == [str(p) for p in pdfs]
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from gInvoiceParser.pipeline import BatchPipeline
+from gInvoiceParser.storage import LocalStorage
+
+from synthetic import pdf_bytes
+from samples import vendor_pages
+
+PRODUCTS = ("GOOGLE_WORKSPACE", "DV360")
+
+
+def _drop(storage, product, seed, name=None):
+    name = name or f"{product.lower()}_{seed}.pdf"
+    storage.write_bytes(f"batch_ingest/{name}", pdf_bytes(vendor_pages(product, 2, seed)))
+    return name
+
+
+def test_pipeline_on_local_storage(tmp_path):
+    storage = LocalStorage(tmp_path / "bucket")
+    names = [_drop(storage, product, seed) for product in PRODUCTS for seed in range(2)]
+    storage.write_bytes("batch_ingest/notes.txt", b"not an invoice")
+
+    summary = BatchPipeline(storage, workers=2, io_threads=2).run()
+
+    assert summary["documents"] == 4
+    assert summary["skipped"] == 0
+    assert summary["failed"] == []
+    assert sorted(summary["outputs"]) == ["aggregates/aggregate_summary.csv", "aggregates/dv360.csv",
+                                          "aggregates/google_workspace.csv"]
+    for product in PRODUCTS:
+        rows = pd.read_csv(storage.path(f"aggregates/{product.lower()}.csv"))
+        assert len(rows) == summary["rows"][product] > 0
+    aggregate = pd.read_csv(storage.path("aggregates/aggregate_summary.csv"))
+    assert sorted(aggregate["Filename"]) == sorted(names)
+
+    # Parsed PDFs are moved out of the ingest prefix and into the ledger
+    assert storage.list("batch_ingest/") == ["batch_ingest/notes.txt"]
+    assert storage.list("processed_files/") == sorted(f"processed_files/{name}" for name in names)
+    assert storage.list("processed_ledger/")
+
+    # A second run skips (and cleans up) re-dropped files and only parses new ones
+    _drop(storage, "GOOGLE_WORKSPACE", 0)
+    new = _drop(storage, "GOOGLE_WORKSPACE", 5)
+    summary = BatchPipeline(storage, workers=2, io_threads=2).run()
+
+    assert summary["documents"] == 1
+    assert summary["skipped"] == 1
+    assert summary["rows"] == {"GOOGLE_WORKSPACE": summary["rows"]["GOOGLE_WORKSPACE"]}
+    assert storage.list("batch_ingest/") == ["batch_ingest/notes.txt"]
+    assert storage.exists(f"processed_files/{new}")
+    aggregate = pd.read_csv(storage.path("aggregates/aggregate_summary.csv"))
+    assert list(aggregate["Filename"]) == [new]
+
+
+def test_pipeline_leaves_unparsed_files_in_place(tmp_path):
+    storage = LocalStorage(tmp_path / "bucket")
+    storage.write_bytes("batch_ingest/broken.pdf", b"%PDF-1.4 truncated")
+
+    summary = BatchPipeline(storage, workers=1, io_threads=1).run()
+
+    assert summary["documents"] == 1
+    assert [failure["file"] for failure in summary["failed"]] == ["batch_ingest/broken.pdf"]
+    assert storage.exists("batch_ingest/broken.pdf")
+    assert len(BatchPipeline(storage).ledger.load()) == 0
@@ -0,0 +1,74 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from gInvoiceParser import manifest  # noqa: E402
+from gInvoiceParser.extractor.google_workspace import extract_google_workspace  # noqa: E402
+from gInvoiceParser.parser import SuperHeroFlex, extractor_map  # noqa: E402
+from gInvoiceParser.results import ResultCache  # noqa: E402
+
+
+def _frames():
+    return [pd.DataFrame({"Amount": pd.array(["1.00", None], dtype="string"), "filename": ["a.pdf", "a.pdf"]}),
+            pd.DataFrame({"Other": pd.array(["1", "2", None], dtype="string")})]
+
+
+def test_put_and_get_point_rows_at_the_copy(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("f" * 64, "DV360", _frames(), extractor_map["DV360"], "/in/a.pdf")
+    assert cache.lookup("f" * 64, extractor_map) == "DV360"
+
+    frames = cache.get("f" * 64, "DV360", extractor_map["DV360"], "/elsewhere/b.pdf")
+    assert list(frames[0]["filename"]) == ["b.pdf", "b.pdf"]
+    pd.testing.assert_frame_equal(frames[1], _frames()[1])
+
+    cache.put("e" * 64, "DV360", [], extractor_map["DV360"])
+    assert cache.get("e" * 64, "DV360", extractor_map["DV360"]) == []
+
+
+def test_same_content_under_another_name_is_a_hit(invoice, tmp_path):
+    pdf = invoice("DV360")
+    copy = shutil.copy(pdf, tmp_path / "resent.pdf")
+    first = SuperHeroFlex(file_paths=[pdf], result_cache=ResultCache(tmp_path / "cache"))
+    first.extract_all()
+
+    again = SuperHeroFlex(file_paths=[copy], result_cache=ResultCache(tmp_path / "cache"))
+    again.extract_all()
+    assert again.cached == [str(copy)]
+    rows = again.results_by_product["DV360"][0]
+    assert set(rows["filename"]) == {"resent.pdf"}
+    pd.testing.assert_frame_equal(rows.drop(columns="filename"),
+                                  first.results_by_product["DV360"][0].drop(columns="filename"))
+
+
+def test_extractor_changes_invalidate_entries(invoice, tmp_path, monkeypatch):
+    pdf = invoice("DV360")
+    SuperHeroFlex(file_paths=[pdf], result_cache=ResultCache(tmp_path)).extract_all()
+    digest = next((tmp_path / "DV360").glob("*/*.parquet")).stem
+
+    assert ResultCache(tmp_path).lookup(digest, extractor_map) == "DV360"
+    # Another DV360 extractor (its source changed) misses...
+    assert ResultCache(tmp_path).lookup(digest, {**extractor_map, "DV360": extract_google_workspace}) is None
+    # ...and so does a change to the shared code the rows go through
+    monkeypatch.setattr(manifest, "RESULT_FORMAT_VERSION", manifest.RESULT_FORMAT_VERSION + 1)
+    stale = ResultCache(tmp_path)
+    assert stale.lookup(digest, extractor_map) is None
+
+    flex = SuperHeroFlex(file_paths=[pdf], result_cache=stale)
+    flex.extract_all()
+    assert flex.cached == [] and flex.row_counts["DV360"] > 0
+    assert stale.prune(extractor_map) == 1
+    assert len(list((tmp_path / "DV360").iterdir())) == 1
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("f" * 64, "DV360", _frames(), extractor_map["DV360"])
+    path = next(tmp_path.glob("DV360/*/*.parquet"))
+    path.write_bytes(b"not parquet")
+
+    assert cache.get("f" * 64, "DV360", extractor_map["DV360"]) is None
+    assert not path.exists() and cache.lookup("f" * 64, extractor_map) is None
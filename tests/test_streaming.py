@@ -0,0 +1,61 @@
+import pandas as pd
+
+from gInvoiceParser.backends import get_backend
+from gInvoiceParser.cache import TextCache
+from gInvoiceParser.document import InvoiceDocument
+from gInvoiceParser.extractor.dv360 import DV360Extractor, extract_dv360
+from gInvoiceParser.parser import TEXT_EXTRACTION_SETTINGS, open_text_dict
+
+from samples import text_dict
+
+
+def _extractor():
+    return DV360Extractor("", "dv360.pdf", "")
+
+
+def test_stream_yields_rows_page_by_page():
+    doc = InvoiceDocument(text_dict("DV360", 4))
+    frames = list(_extractor().stream(doc.iter_pages()))
+
+    # The summary row comes with page 1, then each detail page's rows as it is parsed
+    assert len(frames) == 4
+    assert list(frames[0]["RowType"]) == ["summary"]
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), _extractor().run(doc.iter_pages()))
+
+
+def test_streamed_pages_are_not_kept(invoice):
+    pdf = invoice("DV360", n_pages=20)
+    with open_text_dict(pdf) as pages:
+        rows = extract_dv360(InvoiceDocument(pages, str(pdf)), "", str(pdf), "")
+        assert len(rows) > 20
+        assert pages.extracted == {}
+
+
+def test_text_cache_is_written_through(invoice, tmp_path):
+    pdf = invoice("DV360", n_pages=20)
+    cache = TextCache(tmp_path / "cache")
+    with open_text_dict(pdf, cache) as pages:
+        first = extract_dv360(InvoiceDocument(pages, str(pdf)), "", str(pdf), "")
+        assert pages.extracted == {}
+
+    key = cache.key_for(pdf.read_bytes(), TEXT_EXTRACTION_SETTINGS, get_backend().fingerprint)
+    entry = cache.get(key)
+    assert entry["page_count"] == 20 and len(entry["pages"]) == 20
+
+    # Served entirely from the cache: the PDF isn't opened again
+    with open_text_dict(pdf, cache) as pages:
+        again = extract_dv360(InvoiceDocument(pages, str(pdf)), "", str(pdf), "")
+        assert pages._pdf is None
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_partly_cached_entry_is_completed(invoice, tmp_path):
+    pdf = invoice("DV360", n_pages=5)
+    cache = TextCache(tmp_path / "cache")
+    with open_text_dict(pdf, cache) as pages:
+        pages["page_1"]
+    with open_text_dict(pdf, cache) as pages:
+        list(InvoiceDocument(pages).iter_pages())
+
+    key = cache.key_for(pdf.read_bytes(), TEXT_EXTRACTION_SETTINGS, get_backend().fingerprint)
+    assert sorted(cache.get(key)["pages"]) == [f"page_{i}" for i in range(1, 6)]
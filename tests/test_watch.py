@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pandas as pd
+
+from gInvoiceParser import watch
+from gInvoiceParser.manifest import Manifest
+from gInvoiceParser.parser import process_pdf_job
+from gInvoiceParser.sinks import CSVSink
+from gInvoiceParser.watch import InvoiceWatcher
+
+
+def _slow_job(*args, **kwargs):
+    time.sleep(1.5)
+    return process_pdf_job(*args, **kwargs)
+
+
+def _watcher(folder, out):
+    return InvoiceWatcher(folder, sink=CSVSink(out, append=True), manifest=Manifest(out / ".manifest", autosave_every=1),
+                          workers=1, poll=True, poll_interval=0.05, settle=0.1)
+
+
+def _run_until(watcher, done, timeout=20):
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    watcher.stop()
+    thread.join(timeout)
+    assert not thread.is_alive()
+
+
+def test_processes_drops_and_skips_them_after_a_restart(invoice, tmp_path):
+    folder, out = tmp_path / "in", tmp_path / "out"
+    invoice("DV360", directory=folder)
+
+    first = _watcher(folder, out)
+    _run_until(first, lambda: first.processed == 1)
+    rows = len(pd.read_csv(out / "dv360_invoices.csv"))
+    assert rows == first.flex.row_counts["DV360"] > 0
+
+    # After a restart only the new invoice is parsed and appended
+    invoice("DV360", seed=1, directory=folder)
+    again = _watcher(folder, out)
+    _run_until(again, lambda: again.processed == 1)
+    time.sleep(0.3)
+    assert again.processed == 1
+    assert len(pd.read_csv(out / "dv360_invoices.csv")) == rows + again.flex.row_counts["DV360"]
+
+
+def test_draining_after_stop_does_not_spin(invoice, tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "process_pdf_job", _slow_job)
+    folder, out = tmp_path / "in", tmp_path / "out"
+    invoice("DV360", directory=folder)
+    watcher = _watcher(folder, out)
+
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    time.sleep(0.8)  # settled, queued and in flight
+    cpu = time.process_time()
+    watcher.stop()
+    thread.join(10)
+
+    # The job in flight is finished, without busy-waiting for it
+    assert watcher.processed == 1
+    assert time.process_time() - cpu < 0.3